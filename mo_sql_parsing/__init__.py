@@ -11,12 +11,10 @@
 import json
 from threading import Lock
 
-from mo_parsing import debug
+from mo_sql_parsing import cache, deep, memo, simple_select, snapshot, templates
+from mo_sql_parsing.operators import simple_op, normal_op
 
-from mo_sql_parsing.sql_parser import scrub
-from mo_sql_parsing.utils import ansi_string, simple_op, normal_op
-
-parse_locker = Lock()  # ENSURE ONLY ONE PARSING AT A TIME
+parse_locker = Lock()  # ENSURE ONLY ONE GRAMMAR IS BUILT AT A TIME
 common_parser = None
 mysql_parser = None
 sqlserver_parser = None
@@ -33,11 +31,11 @@ def parse(sql, null=SQL_NULL, calls=simple_op):
     """
     global common_parser
 
-    with parse_locker:
-        if not common_parser:
-            common_parser = sql_parser.common_parser()
-        result = _parse(common_parser, sql, null, calls)
-        return result
+    if not common_parser:
+        with parse_locker:
+            if not common_parser:
+                common_parser = _build("common")
+    return _parse(common_parser, "common", sql, null, calls)
 
 
 def parse_mysql(sql, null=SQL_NULL, calls=simple_op):
@@ -49,10 +47,11 @@ def parse_mysql(sql, null=SQL_NULL, calls=simple_op):
     """
     global mysql_parser
 
-    with parse_locker:
-        if not mysql_parser:
-            mysql_parser = sql_parser.mysql_parser()
-        return _parse(mysql_parser, sql, null, calls)
+    if not mysql_parser:
+        with parse_locker:
+            if not mysql_parser:
+                mysql_parser = _build("mysql")
+    return _parse(mysql_parser, "mysql", sql, null, calls)
 
 
 def parse_sqlserver(sql, null=SQL_NULL, calls=simple_op):
@@ -64,32 +63,96 @@ def parse_sqlserver(sql, null=SQL_NULL, calls=simple_op):
     """
     global sqlserver_parser
 
-    with parse_locker:
-        if not sqlserver_parser:
-            sqlserver_parser = sql_parser.sqlserver_parser()
-        return _parse(sqlserver_parser, sql, null, calls)
+    if not sqlserver_parser:
+        with parse_locker:
+            if not sqlserver_parser:
+                sqlserver_parser = _build("sqlserver")
+    return _parse(sqlserver_parser, "sqlserver", sql, null, calls)
 
 
 parse_bigquery = parse_mysql
 
 
-def _parse(parser, sql, null, calls):
-    utils.null_locations = []
-    utils.scrub_op = calls
+def _build(dialect):
+    # THE GRAMMAR MODULES ARE IMPORTED ON FIRST USE, NOT WITH THE PACKAGE, SO format() NEVER LOADS THEM
+    from mo_sql_parsing import sql_parser
+
+    return snapshot.load_or_build(dialect, getattr(sql_parser, f"{dialect}_parser"))
+
+
+def _parse(parser, dialect, sql, null, calls):
+    parse_cache = cache.parse_cache
+    if parse_cache is None:
+        return _parse_template(parser, dialect, sql, null, calls)
+    key = parse_cache.key(dialect, sql, null, calls)
+    if key is None:
+        return _parse_template(parser, dialect, sql, null, calls)
+    output = parse_cache.get(key)
+    if output is None:
+        output = _parse_template(parser, dialect, sql, null, calls)
+        parse_cache.add(key, output)
+    return output
+
+
+def _parse_template(parser, dialect, sql, null, calls):
+    template_cache = templates.template_cache
+    if template_cache is None:
+        return _parse_string(parser, dialect, sql, null, calls)
+    return templates.parse(template_cache, _parse_string, parser, dialect, sql, null, calls)
+
+
+def _parse_string(parser, dialect, sql, null, calls):
+    # ALL PARSE STATE IS LOCAL TO THIS CALL, SO MANY THREADS MAY SHARE THE (READ-ONLY) GRAMMAR
+    from mo_parsing import ParseException
+    from mo_sql_parsing.utils import describe_failure, scrub
+
     sql = sql.rstrip().rstrip(";")
-    parse_result = parser.parse_string(sql, parse_all=True)
-    output = scrub(parse_result)
-    for o, n in utils.null_locations:
-        o[n] = null
+    previous_memo = memo.begin()
+    try:
+        parse_result = simple_select.parse(sql) if simple_select.enabled else None
+        if parse_result is None:
+            parse_result = parser.parse_string(sql, parse_all=True)
+        output = scrub(parse_result, calls, null)
+    except ParseException:
+        failure = describe_failure(parser, sql)
+        if failure is None:
+            raise
+        raise failure from None
+    except RecursionError:
+        if not deep.enabled:
+            raise
+        output = deep.parse(parser, dialect, sql, null, calls)
+        if output is None:
+            raise
+    finally:
+        memo.end(previous_memo)
     return output
 
 
+def __getattr__(name):
+    # ansi_string AND debug ARE STILL EXPORTED, BUT IMPORTED ON FIRST USE, SO import mo_sql_parsing DOES NOT LOAD
+    # THE GRAMMAR MODULES
+    if name == "ansi_string":
+        from mo_sql_parsing.utils import ansi_string
+
+        return ansi_string
+    if name == "debug":
+        from mo_parsing import debug
+
+        return debug
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def format(json, **kwargs):
     from mo_sql_parsing.formatting import Formatter
 
     return Formatter(**kwargs).dispatch(json)
 
 
+from mo_sql_parsing.bulk import parse_many
+from mo_sql_parsing.inserts import insert_columns, iter_insert_rows
+from mo_sql_parsing.scripts import parse_script
+
 _ = json.dumps
 
-__all__ = ["parse", "format", "parse_mysql", "parse_bigquery", "normal_op", "simple_op"]
+__all__ = ["parse", "format", "parse_mysql", "parse_bigquery", "parse_many", "parse_script", "iter_insert_rows", "insert_columns", "normal_op", "simple_op"]
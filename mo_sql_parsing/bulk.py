@@ -0,0 +1,130 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import gc
+import os
+
+from mo_future import text
+
+from mo_sql_parsing import SQL_NULL
+from mo_sql_parsing.operators import simple_op
+
+dialects = {
+    "common": "parse",
+    "ansi": "parse",
+    "mysql": "parse_mysql",
+    "bigquery": "parse_bigquery",
+    "sqlserver": "parse_sqlserver",
+}
+
+_worker = None  # (parse, null, calls) FOR THIS PROCESS
+
+
+def get_parse_function(dialect):
+    """
+    :param dialect: one of the `dialects` keys
+    :return: the parse function for that dialect
+    """
+    import mo_sql_parsing
+
+    name = dialects.get(dialect)
+    if not name:
+        raise Exception(f"Unknown dialect {dialect}, expecting one of {', '.join(sorted(dialects))}")
+    return getattr(mo_sql_parsing, name)
+
+
+def prepare_fork(*dialect_names):
+    """
+    BUILD THE GRAMMARS IN THIS PROCESS, AND FREEZE THEM OUT OF THE GARBAGE COLLECTOR, SO
+    WORKERS STARTED WITH start_method="fork" SHARE THE GRAMMAR PAGES COPY-ON-WRITE
+    :param dialect_names: dialects to build (default is common, mysql and sqlserver)
+    """
+    for dialect in dialect_names or ("common", "mysql", "sqlserver"):
+        get_parse_function(dialect)("SELECT 1")
+    # THE COLLECTOR WOULD OTHERWISE TOUCH (AND COPY) EVERY GRAMMAR PAGE IN EVERY CHILD
+    gc.collect()
+    gc.freeze()
+
+
+def _init_worker(dialect, null, calls):
+    # ONLY POOL WORKERS USE THE GLOBAL; THEY PARSE FOR ONE parse_many() EACH
+    global _worker
+    parse = get_parse_function(dialect)
+    # BUILD THE GRAMMAR NOW, ONCE PER WORKER, NOT ON THE FIRST ITEM (NO COST IF FORKED AFTER prepare_fork())
+    parse("SELECT 1")
+    _worker = parse, null, calls
+
+
+def _parse_worker_chunk(chunk):
+    return _parse_chunk(chunk, *_worker)
+
+
+def _parse_chunk(chunk, parse, null, calls):
+    output = []
+    for index, sql in chunk:
+        try:
+            output.append((index, parse(sql, null=null, calls=calls), None))
+        except Exception as cause:
+            # ParseException CAN NOT BE PICKLED, SEND THE MESSAGE
+            output.append((index, None, text(cause)))
+    return output
+
+
+def parse_many(
+    sqls,
+    dialect="common",
+    jobs=None,
+    chunksize=100,
+    ordered=True,
+    null=SQL_NULL,
+    calls=simple_op,
+    start_method=None,
+):
+    """
+    PARSE MANY SQL STATEMENTS USING A POOL OF PROCESSES
+    :param sqls: iterable of SQL strings (consumed lazily)
+    :param dialect: one of "common", "mysql", "bigquery", "sqlserver"
+    :param jobs: number of worker processes (default is cpu count), 1 will parse in this process
+    :param chunksize: number of statements sent to a worker at a time
+    :param ordered: True to emit results in the same order as given, False to emit as soon as ready
+    :param null: What value to use as NULL (default is the null function `{"null":{}}`)
+    :param calls: What to do with function calls (default is the simple_op function `{"op":{}}`)
+    :param start_method: multiprocessing start method; use "fork" after prepare_fork() to share the grammar
+    :return: generator of (index, parse_tree, error) triples; error is the error message, or None
+    """
+    parse = get_parse_function(dialect)  # FAIL EARLY ON UNKNOWN DIALECT, NOT ON THE FIRST next()
+    jobs = jobs or os.cpu_count() or 1
+    chunks = _chunk(enumerate(sqls), chunksize)
+    if jobs == 1:
+        return _parse_here(chunks, parse, null, calls)
+    return _parse_pooled(chunks, dialect, jobs, ordered, null, calls, start_method)
+
+
+def _parse_here(chunks, parse, null, calls):
+    for chunk in chunks:
+        yield from _parse_chunk(chunk, parse, null, calls)
+
+
+def _parse_pooled(chunks, dialect, jobs, ordered, null, calls, start_method):
+    from multiprocessing import get_context
+
+    with get_context(start_method).Pool(jobs, initializer=_init_worker, initargs=(dialect, null, calls)) as pool:
+        mapper = pool.imap if ordered else pool.imap_unordered
+        for results in mapper(_parse_worker_chunk, chunks):
+            yield from results
+
+
+def _chunk(values, size):
+    acc = []
+    for v in values:
+        acc.append(v)
+        if len(acc) == size:
+            yield acc
+            acc = []
+    if acc:
+        yield acc
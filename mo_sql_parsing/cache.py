@@ -0,0 +1,115 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# OPT-IN CACHE OF PARSE RESULTS, FOR PROGRAMS THAT PARSE THE SAME SQL OVER AND OVER
+#
+#     from mo_sql_parsing import cache
+#     cache.enable(size=10000, max_bytes=64 * 1024 * 1024)
+#
+import marshal
+from collections import OrderedDict
+from threading import Lock
+
+parse_cache = None  # THE ParseCache USED BY parse*(), None TO DISABLE
+
+
+class ParseCache(object):
+    """
+    LEAST-RECENTLY-USED CACHE OF PARSE RESULTS, BOUNDED BY NUMBER OF ENTRIES AND BY BYTES
+
+    RESULTS ARE KEPT marshal-ED: EACH HIT IS A FRESH TREE THE CALLER MAY MUTATE, AND
+    UNMARSHALLING COSTS FAR LESS THAN copy.deepcopy(). THE BYTE BUDGET IS THE SUM OF
+    THE marshal-ED SIZES.
+    """
+
+    def __init__(self, size=1000, max_bytes=64 * 1024 * 1024):
+        self.size = size
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.data = OrderedDict()
+        self.locker = Lock()
+
+    def key(self, dialect, sql, null, calls):
+        """
+        :return: cache key, or None if this parse can not be cached
+        """
+        try:
+            return dialect, sql, marshal.dumps(null), calls
+        except ValueError:
+            # null IS NOT A PLAIN VALUE
+            return None
+
+    def get(self, key):
+        """
+        :return: a fresh copy of the cached parse tree, or None
+        """
+        with self.locker:
+            value = self.data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.data.move_to_end(key)
+            self.hits += 1
+        return marshal.loads(value)
+
+    def add(self, key, result):
+        try:
+            value = marshal.dumps(result)
+        except ValueError:
+            # calls EMITTED SOMETHING OTHER THAN PLAIN VALUES
+            return
+        if len(value) > self.max_bytes:
+            return
+        with self.locker:
+            old = self.data.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old)
+            self.data[key] = value
+            self.bytes += len(value)
+            while len(self.data) > self.size or self.bytes > self.max_bytes:
+                _, old = self.data.popitem(last=False)
+                self.bytes -= len(old)
+                self.evictions += 1
+
+    def clear(self):
+        with self.locker:
+            self.data.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.locker:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.data),
+                "bytes": self.bytes,
+            }
+
+    def __len__(self):
+        return len(self.data)
+
+
+def enable(size=1000, max_bytes=64 * 1024 * 1024):
+    """
+    START CACHING PARSE RESULTS
+    :param size: maximum number of cached statements
+    :param max_bytes: maximum (marshal-ed) size of all cached parse trees
+    :return: the ParseCache, for its stats()
+    """
+    global parse_cache
+    parse_cache = ParseCache(size, max_bytes)
+    return parse_cache
+
+
+def disable():
+    global parse_cache
+    parse_cache = None
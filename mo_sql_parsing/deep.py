@@ -0,0 +1,342 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# DEEP-INPUT MODE: THE GRAMMAR RECURSES FOR EVERY LEVEL OF NESTING, SO DEEPLY NESTED STATEMENTS RAISE
+# RecursionError.  WHEN THAT HAPPENS, THE NESTING (PARENTHESES, AND CASE ... END) IS CUT INTO LAYERS NO DEEPER THAN
+# max_depth, FROM THE INSIDE OUT.  EACH INNER LAYER IS PARSED ON ITS OWN, BY THE simple_select EXPRESSION PARSER
+# (WHICH DOES NOT RECURSE) IF IT CAN, OR ELSE BY THE GRAMMAR, AND IS REPLACED WITH A PLACEHOLDER IDENTIFIER IN THE
+# LAYER AROUND IT.  THE GRAMMAR PARSES WHAT IS LEFT, AND THE LAYERS ARE PUT BACK WHERE THE PLACEHOLDERS ARE.
+#
+#     from mo_sql_parsing import deep
+#     deep.enable(depth=8)
+#
+# A LAYER IS AN EXPRESSION IN PARENTHESES, A FUNCTION CALL, A CASE, OR A SUB-QUERY; PARENTHESES THE GRAMMAR
+# GIVES ANOTHER MEANING (LISTS, DDL, VALUES, ETC) ARE NOT CUT
+#
+import re
+
+from mo_sql_parsing import memo
+from mo_sql_parsing.operators import normal_op, simple_op
+from mo_sql_parsing.simple_select import Bail, _Parser, _associative, _is_special, _tokenize
+
+enabled = True  # RETRY STATEMENTS THAT RAISE RecursionError
+max_depth = 8  # NESTING DEEPER THAN THIS IS CUT INTO LAYERS
+
+# KEYWORDS THAT MAY BE FOLLOWED BY A PARENTHESISED EXPRESSION, OR SUB-QUERY
+expression_keywords = {
+    "and",
+    "between",
+    "by",
+    "case",
+    "distinct",
+    "else",
+    "exists",
+    "from",
+    "having",
+    "in",
+    "join",
+    "like",
+    "not",
+    "on",
+    "or",
+    "select",
+    "then",
+    "when",
+    "where",
+}
+
+# STATEMENTS THAT MAY BE CUT; IN DDL, PARENTHESES ARE MOSTLY NOT EXPRESSIONS
+statement_keywords = {"delete", "insert", "select", "update", "values", "with"}
+query_keywords = {"select", "with"}
+_first_word = re.compile(r"\s*(?:\(\s*)*([A-Za-z]+)")
+
+_skip = r"""'(?:''|[^'])*'|--[^\n]*|\#[^\n]*|/\*.*?\*/|"(?:""|[^"])*"|`(?:``|[^`])*`"""
+_mysql_skip = r"""'(?:''|\\.|[^'\\])*'|--[^\n]*|\#[^\n]*|/\*.*?\*/|"(?:""|\\.|[^"\\])*"|`(?:``|[^`])*`"""
+_groups = r"""(?P<open>\()|(?P<close>\))|(?P<comma>,)|(?i:\b(?P<case>case)\b|\b(?P<end>end)\b)"""
+ansi_groups = re.compile(f"{_skip}|{_groups}", re.DOTALL)
+mysql_groups = re.compile(f"{_mysql_skip}|{_groups}", re.DOTALL)
+sqlserver_groups = re.compile(f"{_skip}|\\[(?:\\]\\]|[^\\]])*\\]|{_groups}", re.DOTALL)
+dialect_groups = {"mysql": mysql_groups, "sqlserver": sqlserver_groups}
+
+
+def enable(depth=8):
+    """
+    PARSE DEEPLY NESTED STATEMENTS BY CUTTING THEM INTO LAYERS (IT IS ON BY DEFAULT)
+    :param depth: nesting deeper than this is cut
+    """
+    global enabled, max_depth
+
+    max_depth = depth
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def parse(parser, dialect, sql, null, calls):
+    """
+    PARSE sql, WHICH IS TOO DEEP FOR THE GRAMMAR
+    :param dialect: "common", "mysql" OR "sqlserver", FOR THE QUOTING RULES
+    :return: the parse tree, or None if cutting can not help
+    """
+    if calls not in (simple_op, normal_op):
+        # THE LAYERS ARE MERGED WITH THEIR NEIGHBOURS IN THE FORM THESE EMIT
+        return None
+    found = lift(parser, dialect, sql, null, calls)
+    if not found:
+        return None
+    template, values = found
+    tree = _parse_statement(parser, template, null, calls)
+    if tree is None:
+        return None
+    return bind(tree, values, calls)
+
+
+def lift(parser, dialect, sql, null, calls):
+    """
+    :return: (template, values) PAIR, WHERE template IS THE OUTER LAYER OF sql, AND values MAPS EACH PLACEHOLDER
+             IN IT TO THE (SCRUBBED) LAYER IT STANDS FOR; OR None IF NOTHING IS LIFTED
+    """
+    first_word = _first_word.match(sql)
+    if not first_word or first_word.group(1).lower() not in statement_keywords:
+        return None
+
+    prefix = "_deep_"
+    while prefix in sql.lower():
+        prefix += "_"
+    values = {}
+    # FOR EACH OPEN GROUP: [kind, start, height, has_comma, lifted], WHERE height IS THE NESTING INSIDE IT THAT
+    # IS NOT LIFTED, AND lifted IS THE (first, last, placeholder) OF THE LAYERS LIFTED FROM INSIDE IT
+    opened = [[None, 0, 0, False, []]]
+    for match in dialect_groups.get(dialect, ansi_groups).finditer(sql):
+        kind = match.lastgroup
+        if kind is None:
+            # STRING, COMMENT OR QUOTED IDENTIFIER
+            continue
+        elif kind == "open" or kind == "case":
+            opened.append([kind, match.start(), 0, False, []])
+            continue
+        elif kind == "comma":
+            opened[-1][3] = True
+            continue
+        if len(opened) == 1:
+            return None
+        open_kind, start, height, has_comma, lifted = opened.pop()
+        if (open_kind == "open") != (kind == "close"):
+            return None
+        parent = opened[-1]
+        height += 1
+        value = None
+        if height >= max_depth:
+            span = _span(sql, open_kind, start, match.end(), has_comma)
+            if span:
+                first, last = span
+                value = _parse_layer(parser, _fill(sql, first, last, lifted), null, calls)
+        if value is None:
+            parent[2] = max(parent[2], height)
+            parent[4].extend(lifted)
+        else:
+            placeholder = f"{prefix}{len(values)}_"
+            values[placeholder] = bind(value, values, calls)
+            parent[4].append((first, last, placeholder))
+    if len(opened) != 1 or not opened[0][4]:
+        return None
+    return _fill(sql, 0, len(sql), opened[0][4]), values
+
+
+def _span(sql, kind, start, stop, has_comma):
+    """
+    :return: (first, last) OF THE TEXT TO LIFT FOR THE GROUP FROM start TO stop, OR None IF IT CAN NOT BE LIFTED
+    """
+    if kind == "case":
+        return start, stop
+    first, word = _word_before(sql, start)
+    if word:
+        lowered = word.lower()
+        if not _is_special(lowered):
+            if not _expression_at(sql, first):
+                # NOT A CALL (eg INSERT INTO t (a), AS x(a), INTERVAL '1' YEAR(2))
+                return None
+            # function(args)
+            return first, stop
+        if lowered not in expression_keywords:
+            # THE GRAMMAR MAY GIVE THESE PARENTHESES ANOTHER MEANING (eg CHECK (a), VALUES (1))
+            return None
+    elif start and not _expression_at(sql, start):
+        return None
+    inner = _first_word.match(sql, start + 1)
+    if has_comma and not (inner and inner.group(1).lower() in query_keywords):
+        # A LIST
+        return None
+    return start + 1, stop - 1
+
+
+def _fill(sql, first, last, lifted):
+    """
+    :return: sql[first:last], WITH THE lifted LAYERS IN IT REPLACED BY THEIR PLACEHOLDERS
+    """
+    acc = []
+    end = first
+    for start, stop, placeholder in lifted:
+        acc.append(sql[end:start])
+        acc.append(placeholder)
+        end = stop
+    acc.append(sql[end:last])
+    return "".join(acc)
+
+
+def _parse_layer(parser, text, null, calls):
+    """
+    :return: THE SCRUBBED EXPRESSION, OR SUB-QUERY, IN text; OR None IF IT CAN NOT STAND FOR A PLACEHOLDER
+    """
+    from mo_sql_parsing.utils import Call, scrub
+
+    try:
+        simple = _Parser(_tokenize(text))
+        expression = simple.expression()
+        if simple.index == len(simple.tokens) and isinstance(expression, Call):
+            return scrub(expression, calls, null)
+    except Bail:
+        pass
+
+    first_word = _first_word.match(text)
+    if first_word and first_word.group(1).lower() in query_keywords:
+        tree = _parse_statement(parser, text, null, calls)
+        if tree is not None:
+            return tree
+    tree = _parse_statement(parser, f"SELECT {text}", null, calls)
+    if not isinstance(tree, dict) or list(tree) != ["select"]:
+        return None
+    column = tree["select"]
+    if not isinstance(column, dict) or list(column) != ["value"]:
+        return None
+    value = column["value"]
+    if isinstance(value, str) or (isinstance(value, dict) and "literal" not in value):
+        # LITERALS STAY, THE GRAMMAR TREATS THEM DIFFERENTLY FROM PLACEHOLDERS
+        return value
+    return None
+
+
+def _parse_statement(parser, text, null, calls):
+    """
+    :return: THE SCRUBBED PARSE OF text BY THE GRAMMAR, OR None
+    """
+    from mo_parsing.exceptions import ParseException
+    from mo_sql_parsing.utils import scrub
+
+    previous_memo = memo.begin()  # EACH TEXT GETS ITS OWN MEMO
+    try:
+        return scrub(parser.parse_string(text, parse_all=True), calls, null)
+    except (ParseException, RecursionError):
+        return None
+    finally:
+        memo.end(previous_memo)
+
+
+def _expression_at(sql, start):
+    """
+    :return: True IF AN EXPRESSION MAY START AT POSITION start, JUDGING BY WHAT IS BEFORE IT
+    """
+    index = start - 1
+    while index >= 0 and sql[index].isspace():
+        index -= 1
+    if index < 0:
+        return True
+    if sql[index] in "(,+-*/%=<>|&^~!":
+        return True
+    _, word = _word_before(sql, index + 1)
+    return bool(word) and word.lower() in expression_keywords
+
+
+def _word_before(sql, start):
+    """
+    :return: (position, word) OF THE WORD JUST BEFORE POSITION start, OR (None, None)
+    """
+    index = start - 1
+    while index >= 0 and sql[index].isspace():
+        index -= 1
+    end = index + 1
+    while index >= 0 and (sql[index].isalnum() or sql[index] in "_$."):
+        index -= 1
+    word = sql[index + 1 : end]
+    if word and (word[0].isalpha() or word[0] == "_"):
+        return index + 1, word
+    return None, None
+
+
+def bind(tree, values, calls):
+    """
+    PUT THE SCRUBBED values IN PLACE OF THEIR PLACEHOLDERS, MERGING ASSOCIATIVE OPERATORS LIKE THE GRAMMAR DOES
+    :param values: map from placeholder to its scrubbed expression
+    """
+    root = [tree]
+    todo = [(root, None)]  # (container, op IF container IS THE args OF AN ASSOCIATIVE OPERATOR)
+    while todo:
+        node, op = todo.pop()
+        if isinstance(node, list):
+            output = []
+            for v in node:
+                value = values.get(v) if v.__class__ is str else None
+                if value is None:
+                    output.append(v)
+                    if isinstance(v, (list, dict)):
+                        todo.append((v, None))
+                    continue
+                args = _args_of(value, calls, op)
+                if args is None:
+                    output.append(value)
+                else:
+                    output.extend(args)
+            node[:] = output
+        else:
+            op = _associative_op(node, calls)
+            args = _args_of(node, calls, op)
+            for k, v in node.items():
+                value = values.get(v) if v.__class__ is str else None
+                if value is not None:
+                    node[k] = value
+                elif v is args:
+                    todo.append((v, op))
+                elif isinstance(v, (list, dict)):
+                    todo.append((v, None))
+    return root[0]
+
+
+def _associative_op(node, calls):
+    """
+    :return: THE OPERATOR, IF node IS A CALL OF AN ASSOCIATIVE OPERATOR, ELSE None
+    """
+    if calls is simple_op:
+        if len(node) == 1:
+            op = next(iter(node))
+            if op in _associative:
+                return op
+    else:
+        op = node.get("op")
+        if op in _associative:
+            return op
+    return None
+
+
+def _args_of(node, calls, op):
+    """
+    :return: THE args OF node, IF node IS THE op CALL THAT calls EMITS, ELSE None
+    """
+    if not op or not isinstance(node, dict):
+        return None
+    if calls is simple_op:
+        args = node.get(op)
+        if len(node) == 1 and isinstance(args, list):
+            return args
+    elif node.get("op") == op and "kwargs" not in node:
+        args = node.get("args")
+        if isinstance(args, list):
+            return args
+    return None
@@ -12,21 +12,15 @@ import re
 
 from mo_dots import split_field
 from mo_future import first, is_text, string_types, text
-from mo_parsing import listwrap
 
-from mo_sql_parsing.keywords import RESERVED, join_keywords, precedence
-from mo_sql_parsing.utils import binary_ops, is_set_op
+from mo_sql_parsing.operators import binary_ops, is_set_op, join_keywords, listwrap, precedence, reserved_words
 
 MAX_PRECEDENCE = 100
 VALID = re.compile(r"^[a-zA-Z_]\w*$")
 
 
 def is_keyword(identifier):
-    try:
-        RESERVED.parse_string(identifier)
-        return True
-    except Exception:
-        return False
+    return identifier.lower() in reserved_words
 
 
 def should_quote(identifier):
@@ -0,0 +1,192 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# SAME AS mo_parsing.infix_notation(): THE EXPRESSION IS MATCHED AS A FLAT LIST OF OPERANDS AND OPERATORS,
+# BUT THE TREE IS BUILT BY PRECEDENCE CLIMBING, WITH ONE LOOP PER OPERATOR, RATHER THAN BY REPEATEDLY
+# SCANNING THE WHOLE LIST FOR THE OPERATOR OF HIGHEST PRECEDENCE, WHICH IS QUADRATIC IN THE LENGTH OF
+# THE EXPRESSION.
+#
+# THE PRECEDENCE OF AN OPERATOR IS ITS INDEX IN THE spec (LOWER BINDS TIGHTER)
+#
+# IT IS OPT-IN: IT ALSO PARSES A PREFIX OPERATOR AFTER A BINARY ONE (a || - b IS {concat: [a, {neg: b}]}, NOT
+# {concat: [a, "-"]}), AND AN INCOMPLETE BETWEEN IS AN ERROR, SO SOME TREES ARE NOT THE SAME AS BEFORE
+#
+#     from mo_sql_parsing import infix
+#     infix.enable()  # BEFORE THE FIRST parse()
+#
+from mo_parsing import whitespaces
+from mo_parsing.enhancement import Forward, Group, Suppress, ZeroOrMore
+from mo_parsing.exceptions import ParseException
+from mo_parsing.expressions import MatchFirst, Or
+from mo_parsing.infix import LEFT_ASSOC, RIGHT_ASSOC, _no_op
+from mo_parsing.results import NO_PARSER, ParseResults
+from mo_parsing.tokens import Literal
+from mo_parsing.utils import listwrap, wrap_parse_action
+
+PREFIX, SUFFIX, BINARY, TERNARY = "prefix", "suffix", "binary", "ternary"
+
+enabled = False  # BUILD THE GRAMMAR WITH THIS infix_notation, RATHER THAN THE mo_parsing ONE
+
+
+def enable():
+    """
+    BUILD EXPRESSION TREES BY PRECEDENCE CLIMBING; ONLY GRAMMARS BUILT AFTER THIS (THE FIRST parse()) USE IT
+    """
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def infix_notation(base_expr, spec, lpar=Suppress(Literal("(")), rpar=Suppress(Literal(")"))):
+    """
+    :param base_expr: expression representing the most basic element for the nested
+    :param spec: list of (op_expr, num_terms, assoc, parse_action) tuples, one for each operator
+                 precedence level, from highest to lowest (SEE mo_parsing.infix_notation)
+    :param lpar: expression for matching left-parentheses
+    :param rpar: expression for matching right-parentheses
+    :return: ParserElement
+    """
+    normalized = {}
+
+    def norm(op):
+        if op is None:
+            op = _no_op
+        output = normalized.get(id(op))
+        if output:
+            return output
+        output = whitespaces.CURRENT.normalize(op)
+        is_suppressed = isinstance(output, Suppress)
+        if is_suppressed:
+            output = output.expr
+        normalized[id(op)] = is_suppressed, output
+        return is_suppressed, output
+
+    prefixes = {}  # MAP FROM OPERATOR TO (level, kind, expr, is_suppressed, parse_actions, second_op)
+    infixes = {}
+    for level, oper_def in enumerate(spec):
+        op, arity, assoc, rest = oper_def[0], oper_def[1], oper_def[2], oper_def[3:]
+        parse_actions = list(map(wrap_parse_action, listwrap(rest[0]))) if rest else []
+        if arity == 1:
+            is_suppressed, op = norm(op)
+            if assoc == RIGHT_ASSOC:
+                prefixes.setdefault(op, (level, PREFIX, Group(op + base_expr), is_suppressed, parse_actions, None))
+            else:
+                infixes.setdefault(op, (level, SUFFIX, Group(base_expr + op), is_suppressed, parse_actions, None))
+        elif arity == 2:
+            is_suppressed, op = norm(op)
+            infixes.setdefault(op, (level, BINARY, Group(base_expr + op + base_expr), is_suppressed, parse_actions, assoc))
+        elif arity == 3:
+            is_suppressed, op = zip(norm(op[0]), norm(op[1]))
+            infixes.setdefault(
+                op[0],
+                (level, TERNARY, Group(base_expr + op[0] + base_expr + op[1] + base_expr), is_suppressed, parse_actions, op[1]),
+            )
+
+    def record_op(op):
+        def output(tokens):
+            return ParseResults(NO_PARSER, tokens.start, tokens.end, [(tokens, op)], [])
+
+        return output
+
+    prefix_ops = MatchFirst([op / record_op(op) for op in prefixes])
+    suffix_ops = MatchFirst([op / record_op(op) for op, (_, kind, *_) in infixes.items() if kind == SUFFIX])
+    ops = Or([
+        op_part / record_op(op_part)
+        for op_part in set(
+            op_part
+            for op, (_, kind, _, _, _, second) in infixes.items()
+            if kind in (BINARY, TERNARY)
+            for op_part in ([op, second] if kind == TERNARY else [op])
+        )
+    ])
+
+    def make_tree(tokens, loc, string):
+        flat_tokens = list(tokens)
+
+        def fail(index):
+            start = flat_tokens[index][0].start if index < len(flat_tokens) else tokens.end
+            raise ParseException(flat, start, string, "Expecting operator")
+
+        def apply(result, parse_actions):
+            for p in parse_actions:
+                result = p(result, -1, string)
+            return result
+
+        def climb(index, limit):
+            """
+            :param index: where the operand starts in flat_tokens
+            :param limit: only use operators with level below limit
+            :return: (tree, index of next token)
+            """
+            r, o = flat_tokens[index]
+            prefix = prefixes.get(o)
+            if prefix:
+                level, _, expr, is_suppressed, parse_actions, _ = prefix
+                tok, index = climb(index + 1, level)
+                if is_suppressed:
+                    left = ParseResults(expr, tok.start, tok.end, (tok,), [])
+                else:
+                    left = ParseResults(expr, r.start, tok.end, (r, tok), [])
+                left = apply(left, parse_actions)
+            else:
+                left = r
+                index += 1
+
+            while index < len(flat_tokens):
+                r, o = flat_tokens[index]
+                infix = infixes.get(o)
+                if not infix:
+                    break
+                level, kind, expr, is_suppressed, parse_actions, extra = infix
+                if level >= limit:
+                    break
+                if kind == SUFFIX:
+                    if is_suppressed:
+                        left = ParseResults(expr, left.start, left.end, (left,), [])
+                    else:
+                        left = ParseResults(expr, left.start, r.end, (left, r), [])
+                    index += 1
+                elif kind == BINARY:
+                    right, index = climb(index + 1, level + 1 if extra == RIGHT_ASSOC else level)
+                    if is_suppressed:
+                        left = ParseResults(expr, left.start, right.end, (left, right), [])
+                    else:
+                        left = ParseResults(expr, left.start, right.end, (left, r, right), [])
+                else:
+                    middle, index = climb(index + 1, level)
+                    if index >= len(flat_tokens) or flat_tokens[index][1] != extra:
+                        fail(index)
+                    r1 = flat_tokens[index][0]
+                    right, index = climb(index + 1, level)
+                    seq = [left, middle, right]
+                    s0, s1 = is_suppressed
+                    if not s1:
+                        seq.insert(2, r1)
+                    if not s0:
+                        seq.insert(1, r)
+                    left = ParseResults(expr, seq[0].start, seq[-1].end, seq, [])
+                left = apply(left, parse_actions)
+            return left, index
+
+        result, index = climb(0, len(spec))
+        if index < len(flat_tokens):
+            fail(index)
+        # THE PARSE ACTION WRAPPER ADDS tokens.failures TO THE RESULT; SHARING THAT LIST WOULD DOUBLE IT
+        return ParseResults(result.type, result.start, tokens.end, result.tokens, [])
+
+    flat = Forward()
+    iso = lpar.suppress() + flat + rpar.suppress()
+    atom = (base_expr | iso) / record_op(base_expr)
+    decorated = ZeroOrMore(prefix_ops) + atom + ZeroOrMore(suffix_ops)
+    flat << ((decorated + ZeroOrMore(ops + decorated)) / make_tree).streamline()
+
+    return flat.streamline()
@@ -0,0 +1,263 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# STREAM THE ROWS OF AN INSERT ... VALUES STATEMENT (LIKE THOSE IN mysqldump FILES), WITHOUT BUILDING ITS PARSE TREE
+#
+#     rows = iter_insert_rows(sql, dialect="mysql")
+#     table = next(rows)
+#     columns = next(rows)
+#     for row in rows:
+#         ...
+#
+# ONLY THE STATEMENT UP TO VALUES IS PARSED BY THE GRAMMAR.  ROWS OF LITERALS (NUMBERS, STRINGS, NULL, TRUE, FALSE)
+# ARE MATCHED BY ONE REGEX EACH; ANY OTHER ROW IS PARSED BY THE GRAMMAR, ON ITS OWN.  IN THOSE ROWS, A NAME (eg abc,
+# DEFAULT) IS {"identifier": name}, AND AN EXPRESSION IS ITS PARSE TREE
+#
+# insert_columns() COLLECTS THE ROWS INTO COLUMNS; A COLUMN OF ONLY int (OR ONLY float) IS A TYPED array.array,
+# WHICH numpy (AND SO pandas) CAN USE WITHOUT A COPY
+#
+import re
+from array import array
+
+from mo_sql_parsing import SQL_NULL
+from mo_sql_parsing.bulk import get_parse_function
+
+_white = r"[ \t\n\r]*"
+_gap = re.compile(r"(?:\s+|--[^\n]*|\#[^\n]*|/\*.*?\*/)*", re.DOTALL)  # WHITESPACE AND COMMENTS BETWEEN ROWS
+_number = r"[+-]?(?:(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?|\d+(?:[eE]\+?\d+)?)"
+_word = r"(?i:null|true|false)(?![\w$@])"
+_ansi_string = r"'(?:''|[^'])*'"
+# MySQL STRINGS HAVE BACKSLASH ESCAPES, AND MAY USE DOUBLE QUOTES
+_mysql_string = r"""'(?:''|\\.|[^'\\])*'|"(?:""|\\.|[^"\\])*\""""
+_skip = r"""--[^\n]*|\#[^\n]*|/\*.*?\*/|"(?:""|[^"])*"|`(?:``|[^`])*`"""
+_tokens = r"""|(?P<values>(?<![\w$@])(?i:values)(?![\w$@]))|(?P<open>\()|(?P<close>\))"""
+
+
+def _patterns(string, skip):
+    value = f"(?:{_number}|{string}|{_word})"
+    return (
+        # ONE ROW OF LITERALS
+        re.compile(f"{_white}\\({_white}{value}(?:{_white},{_white}{value})*{_white}\\){_white}", re.DOTALL),
+        # THE VALUES IN THAT ROW
+        re.compile(f"{string}|[^\\s,()]+", re.DOTALL),
+        # THE TOKENS THAT MAY HIDE THE VALUES KEYWORD, OR A PARENTHESIS
+        re.compile(f"{string}|{skip}{_tokens}", re.DOTALL),
+    )
+
+
+ansi_patterns = _patterns(_ansi_string, _skip)
+mysql_patterns = _patterns(_mysql_string, _skip)
+sqlserver_patterns = _patterns(_ansi_string, f"{_skip}|\\[(?:\\]\\]|[^\\]])*\\]")
+
+_mysql_escapes = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a", "%": "\\%", "_": "\\_"}
+_mysql_escaped = {"'": re.compile(r"\\(.)|''", re.DOTALL), '"': re.compile(r'\\(.)|""', re.DOTALL)}
+
+
+def iter_insert_rows(sql, dialect="common", null=None):
+    """
+    STREAM THE ROWS OF AN INSERT ... VALUES STATEMENT
+    :param sql: String of SQL, one INSERT INTO table [(columns)] VALUES (...), (...), ... statement
+    :param dialect: one of "common", "mysql", "bigquery", "sqlserver"; "mysql" strings have backslash escapes
+    :param null: What value to use as NULL (default is None)
+    :return: generator of the table name, then the list of columns (None if not given), then a tuple for each row
+    """
+    parse = get_parse_function(dialect)
+    if dialect in ("mysql", "bigquery"):
+        row_pattern, value_pattern, token_pattern = mysql_patterns
+        to_string = _mysql_literal
+    else:
+        row_pattern, value_pattern, token_pattern = sqlserver_patterns if dialect == "sqlserver" else ansi_patterns
+        to_string = _ansi_literal
+    words = {"null": null, "true": True, "false": False}
+
+    for match in token_pattern.finditer(sql):
+        if match.lastgroup == "values":
+            break
+    else:
+        raise Exception("Expecting INSERT ... VALUES statement")
+    header = sql[: match.end()]
+    # THE GRAMMAR DEALS WITH THE QUOTING OF THE TABLE AND COLUMN NAMES
+    tree = parse(header + " (0)")
+    if "insert" not in tree:
+        raise Exception("Expecting INSERT ... VALUES statement")
+    yield tree["insert"]
+    columns = tree.get("columns")
+    yield None if columns is None else _listwrap(columns)
+
+    position = match.end()
+    end = len(sql)
+    while True:
+        match = row_pattern.match(sql, position)
+        if match:
+            row = []
+            for value in value_pattern.findall(sql, match.start(), match.end()):
+                first = value[0]
+                if first in "0123456789+-.":
+                    if "." in value:
+                        row.append(float(value))
+                    elif "e" in value or "E" in value:
+                        row.append(int(float(value)))
+                    else:
+                        row.append(int(value))
+                elif first == "'" or first == '"':
+                    row.append(to_string(value))
+                else:
+                    row.append(words[value.lower()])
+            yield tuple(row)
+            position = match.end()
+        else:
+            stop = _row_end(sql, position, token_pattern)
+            yield _parse_row(parse, header, sql[position:stop], null)
+            position = stop
+        position = _gap.match(sql, position).end()
+        if position < end and sql[position] == ",":
+            position += 1
+            continue
+        rest = sql[position:].strip().rstrip(";").strip()
+        if rest:
+            raise Exception(f"Expecting end of statement, not {rest[:20]!r} (at char {position})")
+        return
+
+
+def insert_columns(sql, dialect="common", null=None, numpy=False):
+    """
+    READ AN INSERT ... VALUES STATEMENT INTO COLUMNS
+    :param sql: String of SQL, one INSERT INTO table [(columns)] VALUES (...), (...), ... statement
+    :param dialect: one of "common", "mysql", "bigquery", "sqlserver"; "mysql" strings have backslash escapes
+    :param null: What value to use as NULL (default is None)
+    :param numpy: True to return the typed columns as numpy arrays (requires `pip install numpy`)
+    :return: (table, columns, values) WHERE columns IS None IF NOT GIVEN, AND values HAS ONE SEQUENCE PER COLUMN:
+             AN array.array("q") OF int, AN array.array("d") OF float, OR A list OF ANYTHING ELSE
+    """
+    if numpy:
+        try:
+            import numpy as np
+        except ImportError:
+            raise Exception("Please `pip install numpy` to get numpy columns") from None
+
+    rows = iter_insert_rows(sql, dialect, null)
+    table = next(rows)
+    columns = next(rows)
+    values = []
+    types = []  # THE TYPE OF EACH TYPED COLUMN, None FOR A list
+    for row in rows:
+        if not values:
+            for value in row:
+                column, type_ = _new_column(value)
+                values.append(column)
+                types.append(type_)
+            continue
+        if len(row) != len(values):
+            raise Exception(f"Expecting {len(values)} values in every row, not {len(row)}")
+        for index, value in enumerate(row):
+            type_ = types[index]
+            if type_ is None:
+                values[index].append(value)
+                continue
+            if value.__class__ is type_:
+                try:
+                    values[index].append(value)
+                    continue
+                except OverflowError:
+                    pass
+            # NOT THE SAME TYPE (OR TOO BIG), SO THE COLUMN BECOMES A list
+            column = values[index].tolist()
+            column.append(value)
+            values[index] = column
+            types[index] = None
+
+    if numpy:
+        values = [np.frombuffer(v, dtype=v.typecode) if isinstance(v, array) else v for v in values]
+    return table, columns, values
+
+
+def _new_column(value):
+    """
+    :return: (column, type) PAIR FOR A COLUMN STARTING WITH value
+    """
+    type_ = value.__class__
+    if type_ is int:
+        try:
+            return array("q", [value]), int
+        except OverflowError:
+            pass
+    elif type_ is float:
+        return array("d", [value]), float
+    return [value], None
+
+
+def _row_end(sql, start, token_pattern):
+    """
+    :return: THE POSITION AFTER THE PARENTHESISED ROW STARTING AT start
+    """
+    depth = 0
+    for match in token_pattern.finditer(sql, start):
+        kind = match.lastgroup
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+            if depth < 0:
+                break
+    raise Exception(f"Expecting (row) at char {start}")
+
+
+def _parse_row(parse, header, row, null):
+    # THE GRAMMAR PARSES A ROW OF THE STATEMENT, SO IT MEANS THE SAME AS IN A FULL parse()
+    select = _listwrap(parse(f"{header} {row}")["query"]["select"])
+    return tuple(_row_value(column["value"], null) for column in select)
+
+
+def _row_value(value, null):
+    """
+    :return: THE PYTHON VALUE OF A LITERAL; {"identifier": name} FOR A NAME, SO IT IS NOT MISTAKEN FOR A STRING;
+             OTHERWISE THE PARSE TREE OF THE EXPRESSION
+    """
+    if isinstance(value, str):
+        return {"identifier": value}
+    if isinstance(value, dict) and value.keys() == {"literal"}:
+        return value["literal"]
+    return _replace_null(value, null)
+
+
+def _replace_null(value, null):
+    if value == SQL_NULL:
+        return null
+    if isinstance(value, dict):
+        return {k: _replace_null(v, null) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_replace_null(v, null) for v in value]
+    return value
+
+
+def _listwrap(value):
+    return value if isinstance(value, list) else [value]
+
+
+def _ansi_literal(text):
+    from mo_sql_parsing.utils import single_literal
+
+    return single_literal([text])["literal"]
+
+
+def _mysql_literal(text):
+    quote = text[0]
+    content = text[1:-1]
+    if "\\" not in content and quote not in content:
+        return content
+    return _mysql_escaped[quote].sub(_mysql_unescape, content)
+
+
+def _mysql_unescape(match):
+    escaped = match.group(1)
+    if escaped is None:
+        # DOUBLED QUOTE
+        return match.group(0)[0]
+    return _mysql_escapes.get(escaped, escaped)
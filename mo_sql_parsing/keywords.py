@@ -10,6 +10,7 @@
 # SQL CONSTANTS
 from mo_parsing import *
 
+from mo_sql_parsing.operators import join_keywords, precedence, reserved_words
 from mo_sql_parsing.utils import SQL_NULL, keyword
 
 NULL = keyword("null") / SQL_NULL
@@ -180,77 +181,8 @@ TO = Keyword("to", caseless=True).suppress()
 SIMILAR_TO = Group(_SIMILAR + TO).set_parser_name("similar_to")
 NOT_SIMILAR_TO = Group(NOT + _SIMILAR + TO).set_parser_name("not_similar_to")
 
-RESERVED = MatchFirst([
-    # ONY INCLUDE SINGLE WORDS
-    AND,
-    AS,
-    ASC,
-    BETWEEN,
-    BY,
-    CASE,
-    COLLATE,
-    CONSTRAINT,
-    CREATE,
-    CROSS,
-    DESC,
-    DISTINCT,
-    EXCEPT,
-    ELSE,
-    END,
-    FALSE,
-    FETCH,
-    FOREIGN,
-    FOR,
-    FROM,
-    FULL,
-    GROUP_BY,
-    GROUP,
-    HAVING,
-    IN,
-    INNER,
-    INTERSECT,
-    IS_NOT,
-    IS,
-    JOIN,
-    LATERAL,
-    LEFT,
-    LIKE,
-    LIMIT,
-    MINUS,
-    NATURAL,
-    NOCASE,
-    NOT,
-    NULL,
-    OFFSET,
-    ON,
-    OR,
-    ORDER,
-    OUTER,
-    OVER,
-    PARTITION,
-    PRIMARY,
-    PIVOT,
-    QUALIFY,
-    REFERENCES,
-    RIGHT,
-    RLIKE,
-    SELECT,
-    SET,
-    STRAIGHT_JOIN,
-    TABLESAMPLE,
-    THEN,
-    TRUE,
-    UNION,
-    UNIQUE,
-    UNNEST,
-    UNPIVOT,
-    USING,
-    WHEN,
-    WHERE,
-    WINDOW,
-    WITH,
-    WITHIN,
-])
+# ONLY SINGLE WORDS; THE NAME OF THE KEYWORD IS ENOUGH TO KNOW IT CAN NOT BE AN IDENTIFIER
+RESERVED = MatchFirst([Keyword(word, caseless=True) for word in sorted(reserved_words)])
 
 LB = Literal("(").suppress()
 RB = Literal(")").suppress()
@@ -259,82 +191,6 @@ RK = Literal("]").suppress()
 EQ = Char("=").suppress()
 comma = Optional(",").suppress()
 
-join_keywords = {
-    "join",
-    "full join",
-    "cross join",
-    "inner join",
-    "left join",
-    "right join",
-    "full outer join",
-    "right outer join",
-    "left outer join",
-    "cross apply",
-    "outer apply",
-}
-
-precedence = {
-    # https://www.sqlite.org/lang_expr.html
-    "literal": -1,
-    "get": 0,
-    "interval": 0,
-    "cast": 0,
-    "try_cast": 0,
-    "validate_conversion": 0,
-    "collate": 0,
-    "concat": 1,
-    "mul": 2,
-    "div": 1.5,
-    "mod": 2,
-    "neg": 3,
-    "add": 3,
-    "sub": 2.5,
-    "binary_not": 4,
-    "binary_and": 4,
-    "binary_or": 4,
-    "gte": 5,
-    "lte": 5,
-    "lt": 5,
-    "gt": 6,
-    "eq": 7,
-    "rgx": 7,
-    "not_rgx": 7,
-    "neq": 7,
-    "missing": 7,
-    "exists": 7,
-    "at_time_zone": 8,
-    "between": 8,
-    "not_between": 8,
-    "not": 8,
-    "in": 8,
-    "nin": 8,
-    "is": 8,
-    "like": 8,
-    "not_like": 8,
-    "rlike": 8,
-    "not_rlike": 8,
-    "ilike": 8,
-    "not_ilike": 8,
-    "similar_to": 8,
-    "not_similar_to": 8,
-    "and": 10,
-    "or": 11,
-    "lambda": 12,
-    "assign": 13,
-    "join": 18,
-    "list": 18,
-    "case": 19,
-    "select": 30,
-    "from": 30,
-    "window": 35,
-    "union": 40,
-    "union_all": 40,
-    "except": 40,
-    "minus": 40,
-    "intersect": 40,
-    "order": 50,
-}
-
 KNOWN_OPS = [
     COLLATE,
     CONCAT,
@@ -0,0 +1,140 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# PACKRAT MEMOIZATION: THE GRAMMAR WRAPS ITS MOST RE-TRIED ELEMENTS (utils.Memo), AND EACH PARSE KEEPS
+# A TABLE OF WHAT THEY MATCHED (OR FAILED TO MATCH) AT EACH POSITION, SO BACKTRACKING DOES NOT PARSE THE
+# SAME TEXT AGAIN.  THE TABLE IS BOUNDED BY ENTRIES AND BY (ESTIMATED) BYTES; THE OLDEST ENTRIES, WHICH
+# ARE USUALLY FOR TEXT THE PARSE HAS MOVED PAST, ARE EVICTED FIRST
+#
+#     from mo_sql_parsing import memo
+#     memo.enable(size=100000, max_bytes=16 * 1024 * 1024)
+#     memo.stats()
+#
+from threading import Lock, local
+
+ENTRY_BYTES = 200  # ESTIMATED SIZE OF A TABLE ENTRY, AND THE RESULT IT HOLDS, NOT COUNTING ITS FAILURES
+POINTER_BYTES = 8
+
+enabled = True
+table_size = 100000  # MAXIMUM ENTRIES PER PARSE
+table_bytes = 16 * 1024 * 1024  # MAXIMUM ESTIMATED BYTES PER PARSE
+
+stats_locker = Lock()
+hits = 0
+misses = 0
+evictions = 0
+
+
+class State(local):
+    """
+    WHAT THE PARSE RUNNING ON THIS THREAD SHARES WITH THE GRAMMAR ELEMENTS
+    """
+
+    table = None  # THE MemoTable OF THE PARSE
+    exhaustive = False  # True WHILE describe_failure() PARSES, SO Dispatch TRIES ALL ITS exprs, AS MatchFirst DOES
+
+
+state = State()
+
+
+class MemoTable(object):
+    """
+    MEMO OF ONE PARSE, KEYED BY (element, position, do_actions)
+    """
+
+    __slots__ = ["size", "max_bytes", "bytes", "hits", "misses", "evictions", "data"]
+
+    def __init__(self, size, max_bytes):
+        self.size = size
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.data = {}  # MAP FROM KEY TO (result or ParseException, estimated bytes)
+
+    def get(self, key):
+        """
+        :return: the ParseResults, or ParseException, or None if not seen
+        """
+        found = self.data.get(key)
+        if found is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return found[0]
+
+    def add(self, key, value, failures):
+        """
+        :param value: ParseResults or ParseException
+        :param failures: number of failures value holds
+        """
+        cost = ENTRY_BYTES + POINTER_BYTES * failures
+        self.data[key] = value, cost
+        self.bytes += cost
+        data = self.data
+        while len(data) > self.size or self.bytes > self.max_bytes:
+            # DICTS KEEP INSERTION ORDER: THE FIRST IS THE OLDEST
+            _, cost = data.pop(next(iter(data)))
+            self.bytes -= cost
+            self.evictions += 1
+
+
+def begin():
+    """
+    START A MEMO TABLE FOR A PARSE ON THIS THREAD
+    :return: the table it replaces, to be given to end()
+    """
+    previous = state.table
+    state.table = MemoTable(table_size, table_bytes) if enabled else None
+    return previous
+
+
+def end(previous):
+    """
+    DROP THE TABLE OF THE PARSE, AND ADD ITS COUNTS TO THE stats()
+    """
+    global hits, misses, evictions
+
+    table = state.table
+    state.table = previous
+    if table is None:
+        return
+    with stats_locker:
+        hits += table.hits
+        misses += table.misses
+        evictions += table.evictions
+
+
+def enable(size=100000, max_bytes=16 * 1024 * 1024):
+    """
+    MEMOIZE (IT IS ON BY DEFAULT)
+    :param size: maximum number of memo entries per parse
+    :param max_bytes: maximum estimated size of the memo of one parse
+    """
+    global enabled, table_size, table_bytes
+
+    table_size = size
+    table_bytes = max_bytes
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def stats():
+    with stats_locker:
+        return {"hits": hits, "misses": misses, "evictions": evictions}
+
+
+def reset():
+    global hits, misses, evictions
+    with stats_locker:
+        hits = misses = evictions = 0
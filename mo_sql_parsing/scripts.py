@@ -0,0 +1,126 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# SPLIT A SCRIPT (A STRING OR AN OPEN FILE) INTO ITS STATEMENTS, WITHOUT READING ALL OF IT AT ONCE
+#
+import mmap
+import re
+
+from mo_sql_parsing import SQL_NULL
+from mo_sql_parsing.bulk import get_parse_function
+from mo_sql_parsing.operators import simple_op
+
+CHUNK_SIZE = 64 * 1024  # CHARACTERS (OR BYTES) READ FROM A FILE AT A TIME
+RELEASE_SIZE = 16 * 1024 * 1024  # BYTES OF A MAPPED FILE TO PASS BEFORE TELLING THE OS WE ARE DONE WITH THEM
+
+# THE TOKENS THAT MAY HIDE A ;  UNTERMINATED TOKENS RUN TO THE END OF THE BUFFER, SO WE KNOW TO READ MORE
+_rest = r"""`(?:``|[^`])*(?:`|\Z)|--[^\n]*|\#[^\n]*|/\*.*?(?:\*/|\Z)|(?P<end>;)"""
+_tokens = r"""'(?:''|[^'])*(?:'|\Z)|"(?:""|[^"])*(?:"|\Z)|""" + _rest
+_sqlserver_tokens = r"\[(?:\]\]|[^\]])*(?:\]|\Z)|" + _tokens
+# MySQL STRINGS HAVE BACKSLASH ESCAPES (SEE inserts._mysql_string); A BACKSLASH AT THE END OF THE BUFFER IS UNTERMINATED
+_mysql_tokens = r"""'(?:''|\\(?:.|\Z)|[^'\\])*(?:'|\Z)|"(?:""|\\(?:.|\Z)|[^"\\])*(?:"|\Z)|""" + _rest
+# SAME COMMENTS THE GRAMMAR IGNORES
+_leading = r"(?:\s+|--[^\n]*|#[^\n]*|/\*.*?(?:\*/|\Z))*"
+
+ansi_tokens = re.compile(_tokens, re.DOTALL)
+sqlserver_tokens = re.compile(_sqlserver_tokens, re.DOTALL)
+mysql_tokens = re.compile(_mysql_tokens, re.DOTALL)
+leading = re.compile(_leading, re.DOTALL)
+# THE SAME, FOR SCANNING bytes, mmap AND memoryview WITHOUT DECODING
+binary_ansi_tokens = re.compile(_tokens.encode("ascii"), re.DOTALL)
+binary_sqlserver_tokens = re.compile(_sqlserver_tokens.encode("ascii"), re.DOTALL)
+binary_mysql_tokens = re.compile(_mysql_tokens.encode("ascii"), re.DOTALL)
+binary_leading = re.compile(_leading.encode("ascii"), re.DOTALL)
+
+dialect_tokens = {"sqlserver": sqlserver_tokens, "mysql": mysql_tokens, "bigquery": mysql_tokens}
+binary_dialect_tokens = {"sqlserver": binary_sqlserver_tokens, "mysql": binary_mysql_tokens, "bigquery": binary_mysql_tokens}
+
+
+def split_script(script, dialect="common", encoding="utf8", release_pages=False):
+    """
+    :param script: SQL text, file-like object with read(), or bytes-like object (bytes, mmap, memoryview)
+    :param dialect: one of "common", "mysql", "bigquery", "sqlserver"
+    :param encoding: encoding of binary scripts
+    :param release_pages: True to tell the OS the pages of an mmap already split are not needed (madvise), so
+                          they need not stay resident.  ONLY FOR A MAP OF A FILE WITH access=ACCESS_READ: THE PAGES
+                          OF ANY OTHER MAP ARE DISCARDED, AND READ BACK AS ZEROS OR AS THE ORIGINAL FILE
+    :return: generator of (offset, sql) for each statement, where offset is the position in the script
+             (in characters for text, in bytes for binary)
+    """
+    if isinstance(script, (str, bytes, bytearray, memoryview, mmap.mmap)):
+        # SCANNED IN PLACE; ONLY EACH STATEMENT IS COPIED (AND DECODED)
+        read = None
+        buffer = script
+        eof = True
+    else:
+        read = script.read
+        buffer = read(CHUNK_SIZE)
+        eof = not buffer
+
+    if isinstance(buffer, str):
+        pattern = dialect_tokens.get(dialect, ansi_tokens)
+        skip, encoding = leading, None
+    else:
+        pattern = binary_dialect_tokens.get(dialect, binary_ansi_tokens)
+        skip = binary_leading
+    release = getattr(buffer, "madvise", None) if release_pages else None
+    released = 0
+
+    base = 0  # OFFSET OF buffer[0] IN THE SCRIPT
+    start = 0  # START OF THE CURRENT STATEMENT IN buffer
+    position = 0  # WHERE TO CONTINUE SCANNING
+    while True:
+        match = pattern.search(buffer, position)
+        if not eof and (match is None or match.end() == len(buffer)):
+            # THE NEXT TOKEN MAY CONTINUE INTO THE NEXT READ: FORGET WHAT IS DONE, AND READ MORE
+            position = max(position, len(buffer) - 1) if match is None else match.start()
+            # READ AT LEAST AS MUCH AS WE HAVE, SO A HUGE STATEMENT IS NOT COPIED ONCE PER CHUNK
+            more = read(max(CHUNK_SIZE, len(buffer) - start))
+            eof = not more
+            buffer, position, base = buffer[start:] + more, position - start, base + start
+            start = 0
+        elif match is None:
+            break
+        elif match.lastgroup == "end":
+            yield from _statement(buffer, base, start, match.start(), skip, encoding)
+            start = position = match.end()
+            if release and start - released > RELEASE_SIZE:
+                # THE PAGES ALREADY PARSED NEED NOT STAY RESIDENT
+                end = start - start % mmap.PAGESIZE
+                release(mmap.MADV_DONTNEED, released, end - released)
+                released = end
+        else:
+            position = match.end()
+    yield from _statement(buffer, base, start, len(buffer), skip, encoding)
+
+
+def _statement(buffer, base, start, end, skip, encoding):
+    # SKIP LEADING COMMENTS, SO offset POINTS TO THE STATEMENT
+    start = skip.match(buffer, start, end).end()
+    if start >= end:
+        return
+    if encoding:
+        yield base + start, str(buffer[start:end], encoding)
+    else:
+        yield base + start, buffer[start:end]
+
+
+def parse_script(script, dialect="common", null=SQL_NULL, calls=simple_op, encoding="utf8", release_pages=False):
+    """
+    PARSE THE ;-SEPARATED STATEMENTS OF A SCRIPT, ONE AT A TIME
+    :param script: SQL text, file-like object with read(), or bytes-like object (bytes, mmap, memoryview)
+    :param dialect: one of "common", "mysql", "bigquery", "sqlserver"
+    :param null: What value to use as NULL (default is the null function `{"null":{}}`)
+    :param calls: What to do with function calls (default is the simple_op function `{"op":{}}`)
+    :param encoding: encoding of binary scripts
+    :param release_pages: True to release the pages of a read-only mmap once they are split (SEE split_script)
+    :return: generator of (offset, parse_tree) for each statement
+    """
+    parse = get_parse_function(dialect)
+    for offset, sql in split_script(script, dialect, encoding, release_pages):
+        yield offset, parse(sql, null=null, calls=calls)
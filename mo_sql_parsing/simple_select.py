@@ -0,0 +1,581 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# A HAND-WRITTEN PARSER FOR THE MOST COMMON STATEMENTS:
+#
+#     SELECT [DISTINCT] columns [FROM tables [JOIN table ON condition]...] [WHERE condition]
+#     [GROUP BY columns] [HAVING condition] [ORDER BY columns] [LIMIT n] [OFFSET n]
+#
+# IT EMITS WHAT THE GRAMMAR'S PARSE ACTIONS WOULD (Call, dict, list), SO scrub() TURNS IT INTO THE SAME
+# PARSE TREE.  ANYTHING ELSE (QUOTED IDENTIFIERS, COMMENTS, SUB-QUERIES, KEYWORDS THE GRAMMAR GIVES MEANING
+# TO, ...) RETURNS None, AND THE STATEMENT IS PARSED BY THE GRAMMAR.
+#
+import re
+from threading import Lock, local
+
+from mo_sql_parsing.operators import reserved_words
+
+enabled = True  # USE THE FAST PATH BEFORE THE GRAMMAR
+
+# EACH THREAD COUNTS IN ITS OWN [hits, misses], SO COUNTING NEEDS NO LOCK; stats() ADDS THEM UP
+# hits IS THE NUMBER OF STATEMENTS PARSED BY THE FAST PATH, misses THE NUMBER LEFT TO THE GRAMMAR
+stats_locker = Lock()
+counters = []
+state = local()
+
+_tokens = re.compile(
+    r"""
+    \s+
+    |(?P<string>'(?:''|[^'\\])*')(?!['"`])
+    |(?P<number>\d+(?:\.\d+)?)(?![\w$@.])
+    |(?P<word>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*(?:\.\*)?)(?![\w$@'"`.\-])
+    |(?P<op>(?:<=|>=|<>|!=|[=<>])(?![=<>!~&|^@-])|\|\|(?!\|)|[(),]|[*+%/](?![*/=])|-(?![-=>]))
+    """,
+    re.VERBOSE,
+)
+
+# WORDS THE GRAMMAR GIVES MEANING TO, WHERE THIS PARSER WOULD SEE AN IDENTIFIER
+special_words = reserved_words | {
+    "array",
+    "case",
+    "cast",
+    "convert",
+    "date",
+    "datetime",
+    "exists",
+    "extract",
+    "filter",
+    "ilike",
+    "interval",
+    "map",
+    "nocase",
+    "regexp",
+    "safe_cast",
+    "similar",
+    "stack",
+    "struct",
+    "substring",
+    "time",
+    "timestamp",
+    "top",
+    "trim",
+    "try_cast",
+    "validate_conversion",
+    "values",
+}
+
+# BINARY OPERATORS, AND THEIR PRECEDENCE (LOWER BINDS TIGHTER), IN THE ORDER OF keywords.KNOWN_OPS
+_binary = {
+    "||": ("concat", 1),
+    "*": ("mul", 4),
+    "/": ("div", 4),
+    "%": ("mod", 4),
+    "+": ("add", 5),
+    "-": ("sub", 5),
+    ">=": ("gte", 9),
+    "<=": ("lte", 9),
+    "<": ("lt", 9),
+    ">": ("gt", 9),
+    "=": ("eq", 10),
+    "!=": ("neq", 10),
+    "<>": ("neq", 10),
+}
+_keyword_ops = {
+    # (WORDS, op, precedence)
+    "between": (["between"], "between", 12),
+    "not between": (["not", "between"], "not_between", 13),
+    "in": (["in"], "in", 14),
+    "not in": (["not", "in"], "nin", 15),
+    "is not": (["is", "not"], "is_not", 16),
+    "is": (["is"], "is", 17),
+    "like": (["like"], "like", 18),
+    "not like": (["not", "like"], "not_like", 20),
+    "and": (["and"], "and", 26),
+    "or": (["or"], "or", 27),
+}
+_operator_words = {w for words, _, _ in _keyword_ops.values() for w in words[:1]} - {"and", "or"}
+NEG_PRECEDENCE = 3  # THE GRAMMAR APPLIES - TO A NUMBER AFTER ||, SO -1 || x IS neg(concat(1, x))
+NOT_PRECEDENCE = 25
+ALL_PRECEDENCE = 100
+_associative = {"add", "mul", "and", "or", "concat"}
+_joins = {
+    ("join",): "join",
+    ("inner", "join"): "inner join",
+    ("left", "join"): "left join",
+    ("left", "outer", "join"): "left outer join",
+    ("right", "join"): "right join",
+    ("right", "outer", "join"): "right outer join",
+    ("full", "join"): "full join",
+    ("full", "outer", "join"): "full outer join",
+    ("cross", "join"): "cross join",
+}
+
+
+class Bail(Exception):
+    pass
+
+
+def parse(sql):
+    """
+    :param sql: the SQL, without trailing semicolon
+    :return: what the grammar's parse actions would emit (for scrub()), or None IF THE FAST PATH CAN NOT PARSE IT
+    """
+    counter = _counter()
+    try:
+        output = _Parser(_tokenize(sql)).statement()
+        counter[0] += 1
+        return output
+    except (Bail, RecursionError):
+        counter[1] += 1
+        return None
+
+
+def _counter():
+    """
+    :return: THE [hits, misses] OF THIS THREAD
+    """
+    counter = getattr(state, "counter", None)
+    if counter is None:
+        counter = state.counter = [0, 0]
+        with stats_locker:
+            counters.append(counter)
+    return counter
+
+
+def stats():
+    with stats_locker:
+        return {"hits": sum(c[0] for c in counters), "misses": sum(c[1] for c in counters)}
+
+
+def reset():
+    with stats_locker:
+        for counter in counters:
+            counter[0] = counter[1] = 0
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def _tokenize(sql):
+    """
+    :return: list of (kind, text, lowered) TOKENS
+    """
+    output = []
+    end = 0
+    for match in _tokens.finditer(sql):
+        if match.start() != end:
+            raise Bail()
+        end = match.end()
+        kind = match.lastgroup
+        if kind:
+            text = match.group(kind)
+            output.append((kind, text, text.lower()))
+    if end != len(sql):
+        raise Bail()
+    return output
+
+
+class _Parser(object):
+    __slots__ = ["tokens", "index"]
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.index = 0
+
+    def peek(self, offset=0):
+        index = self.index + offset
+        if index < len(self.tokens):
+            return self.tokens[index]
+        return None, None, None
+
+    def is_word(self, word, offset=0):
+        kind, _, lowered = self.peek(offset)
+        return kind == "word" and lowered == word
+
+    def is_op(self, op):
+        kind, text, _ = self.peek()
+        return kind == "op" and text == op
+
+    def expect_word(self, word):
+        if not self.is_word(word):
+            raise Bail()
+        self.index += 1
+
+    def expect_op(self, op):
+        if not self.is_op(op):
+            raise Bail()
+        self.index += 1
+
+    def statement(self):
+        self.expect_word("select")
+        output = {}
+        if self.is_word("distinct"):
+            self.index += 1
+            output["select_distinct"] = self.delimited(self.select_column)
+        else:
+            output["select"] = self.delimited(self.select_column)
+        if self.is_word("from"):
+            self.index += 1
+            output["from"] = self.tables()
+        if self.is_word("where"):
+            self.index += 1
+            output["where"] = self.expression()
+        if self.is_word("group") and self.is_word("by", 1):
+            self.index += 2
+            output["groupby"] = self.delimited(lambda: {"value": self.expression()})
+        if self.is_word("having"):
+            self.index += 1
+            output["having"] = self.expression()
+        if self.is_word("order") and self.is_word("by", 1):
+            self.index += 2
+            output["orderby"] = self.delimited(self.sort_column)
+        if self.is_word("limit"):
+            self.index += 1
+            output["limit"] = self.integer()
+            if self.is_word("offset"):
+                self.index += 1
+                output["offset"] = self.integer()
+        if self.index != len(self.tokens):
+            raise Bail()
+        return output
+
+    def delimited(self, item):
+        output = [item()]
+        while self.is_op(","):
+            self.index += 1
+            output.append(item())
+        return output
+
+    def select_column(self):
+        kind, text, _ = self.peek()
+        if kind == "op" and text == "*":
+            self.index += 1
+            return "*"
+        output = {"value": self.expression()}
+        name = self.alias()
+        if name:
+            output["name"] = name
+        return output
+
+    def sort_column(self):
+        output = {"value": self.expression()}
+        kind, _, lowered = self.peek()
+        if kind == "word" and lowered in ("asc", "desc"):
+            self.index += 1
+            output["sort"] = lowered
+        return output
+
+    def alias(self):
+        if self.is_word("as"):
+            self.index += 1
+            return self.name()
+        kind, text, lowered = self.peek()
+        if kind == "word" and lowered not in special_words and "." not in text:
+            self.index += 1
+            return text
+        return None
+
+    def name(self):
+        kind, text, lowered = self.peek()
+        if kind != "word" or lowered in special_words or "." in text:
+            raise Bail()
+        self.index += 1
+        return text
+
+    def tables(self):
+        output = [self.table()]
+        while True:
+            if self.is_op(","):
+                if isinstance(output[-1], dict) and "value" not in output[-1]:
+                    # NO COMMA AFTER A JOIN
+                    raise Bail()
+                self.index += 1
+                output.append(self.table())
+                continue
+            for words, join in _joins.items():
+                if all(self.is_word(w, i) for i, w in enumerate(words)):
+                    self.index += len(words)
+                    break
+            else:
+                return output
+            output.append(self.join(join))
+
+    def table(self):
+        kind, text, lowered = self.peek()
+        if kind != "word" or _is_special(lowered) or text.endswith("*"):
+            raise Bail()
+        self.index += 1
+        name = self.alias()
+        if name:
+            return {"value": text, "name": name}
+        return text
+
+    def join(self, join):
+        output = {join: self.table()}
+        if self.is_word("on"):
+            self.index += 1
+            output["on"] = self.expression()
+        return output
+
+    def operator_follows(self):
+        """
+        :return: True IF THE NEXT TOKEN IS AN OPERATOR, OTHER THAN and AND or (WHICH BIND LOOSER THAN ALL OTHERS)
+        """
+        kind, text, lowered = self.peek()
+        if kind == "op":
+            return text in _binary
+        return kind == "word" and lowered in _operator_words
+
+    def integer(self):
+        kind, text, _ = self.peek()
+        if kind != "number" or "." in text:
+            raise Bail()
+        self.index += 1
+        return int(text)
+
+    def expression(self, limit=ALL_PRECEDENCE):
+        """
+        PRECEDENCE CLIMBING, LIKE infix.infix_notation(), BUT WITH AN EXPLICIT STACK OF WHAT IS WAITING FOR
+        EACH VALUE, SO DEEP NESTING DOES NOT RECURSE
+        :param limit: only use operators with precedence below limit
+        """
+        from mo_sql_parsing.utils import Call, single_literal
+
+        todo = [(_RETURN,)]  # WHAT IS WAITING FOR THE NEXT VALUE
+        mode = _EXPRESSION
+        while True:
+            if mode is _EXPRESSION:
+                # START AN EXPRESSION, USING OPERATORS BELOW limit
+                if self.is_word("not"):
+                    self.index += 1
+                    todo.append((_NOT, limit))
+                    limit = NOT_PRECEDENCE
+                    continue
+                todo.append((_OPERAND_OF, limit))
+                mode = _OPERAND
+
+            if mode is _OPERAND:
+                kind, text, lowered = self.peek()
+                self.index += 1
+                if kind == "number":
+                    value = float(text) if "." in text else int(text)
+                elif kind == "op" and text == "-":
+                    kind, text, _ = self.peek()
+                    if kind != "number":
+                        raise Bail()
+                    self.index += 1
+                    value = -float(text) if "." in text else -int(text)
+                    kind, text, _ = self.peek()
+                    if kind == "op" and text in _binary and _binary[text][1] < NEG_PRECEDENCE:
+                        raise Bail()
+                elif kind == "string":
+                    value = single_literal([text])
+                elif kind == "word":
+                    if _is_special(lowered):
+                        raise Bail()
+                    if not self.is_op("("):
+                        value = text
+                    elif "." in text:
+                        raise Bail()
+                    else:
+                        self.index += 1
+                        kwargs = {}
+                        if self.is_word("distinct"):
+                            self.index += 1
+                            kwargs["distinct"] = True
+                        if self.is_op(")"):
+                            self.index += 1
+                            value = Call(lowered, [], kwargs)
+                        elif self.is_op("*"):
+                            self.index += 1
+                            self.expect_op(")")
+                            value = Call(lowered, ["*"], kwargs)
+                        else:
+                            todo.append((_ARG, lowered, [], kwargs))
+                            limit, mode = ALL_PRECEDENCE, _EXPRESSION
+                            continue
+                elif kind == "op" and text == "(":
+                    if self.is_word("select"):
+                        raise Bail()
+                    todo.append((_PAREN,))
+                    limit, mode = ALL_PRECEDENCE, _EXPRESSION
+                    continue
+                else:
+                    raise Bail()
+                mode = _VALUE
+
+            if mode is _VALUE:
+                # GIVE value TO WHAT IS WAITING FOR IT
+                waiting = todo.pop()
+                kind = waiting[0]
+                if kind is _OPERAND_OF:
+                    _, limit = waiting
+                    left = value
+                elif kind is _NOT:
+                    _, limit = waiting
+                    left = Call("not", [value], {})
+                elif kind is _BINARY:
+                    _, op, left, limit = waiting
+                    left = _binary_call(op, left, value)
+                elif kind is _LOW:
+                    _, op, left, limit, precedence = waiting
+                    self.expect_word("and")
+                    todo.append((_HIGH, op, left, value, limit))
+                    limit, mode = precedence, _EXPRESSION
+                    continue
+                elif kind is _HIGH:
+                    _, op, left, low, limit = waiting
+                    left = Call(op, [left, low, value], {})
+                elif kind is _LIKE:
+                    _, op, left, limit = waiting
+                    left = Call(op, [left, value], {})
+                elif kind is _PAREN:
+                    self.expect_op(")")
+                    continue
+                elif kind is _ARG:
+                    _, op, args, kwargs = waiting
+                    args.append(value)
+                    if self.is_op(","):
+                        self.index += 1
+                        todo.append(waiting)
+                        limit, mode = ALL_PRECEDENCE, _EXPRESSION
+                        continue
+                    self.expect_op(")")
+                    value = Call(op, args, kwargs)
+                    continue
+                elif kind is _IN_ITEM:
+                    _, op, left, limit, values = waiting
+                    if value.__class__ is float or (value.__class__ is int and value < 0):
+                        # THE GRAMMAR MAKES A LIST OF THESE A {"literal": [...]}
+                        raise Bail()
+                    values.append(value)
+                    if self.is_op(","):
+                        self.index += 1
+                        if self.is_op("("):
+                            # THE GRAMMAR TREATS A LIST WITH PARENTHESIZED ITEMS DIFFERENTLY
+                            raise Bail()
+                        todo.append(waiting)
+                        mode = _OPERAND
+                        continue
+                    self.expect_op(")")
+                    left = Call(op, [left, _in_list(values)], {})
+                    if self.operator_follows():
+                        # THE GRAMMAR APPLIES THE OPERATOR TO THE LIST, NOT TO THE in
+                        raise Bail()
+                else:
+                    return value
+                mode = _LOOP
+
+            # mode is _LOOP: APPLY THE OPERATORS BELOW limit TO left
+            kind, text, lowered = self.peek()
+            if kind == "op" and text in _binary:
+                op, precedence = _binary[text]
+                if precedence >= limit:
+                    value, mode = left, _VALUE
+                    continue
+                self.index += 1
+                todo.append((_BINARY, op, left, limit))
+                limit, mode = precedence, _EXPRESSION
+                continue
+            if kind != "word":
+                value, mode = left, _VALUE
+                continue
+            found = None
+            for words, op, precedence in _keyword_ops.values():
+                if all(self.is_word(w, i) for i, w in enumerate(words)):
+                    if not found or len(words) > len(found[0]):
+                        found = words, op, precedence
+            if not found or found[2] >= limit:
+                value, mode = left, _VALUE
+                continue
+            words, op, precedence = found
+            self.index += len(words)
+            if op in ("between", "not_between"):
+                todo.append((_LOW, op, left, limit, precedence))
+                limit, mode = precedence, _EXPRESSION
+            elif op in ("in", "nin"):
+                self.expect_op("(")
+                if self.is_word("select") or self.is_op("("):
+                    raise Bail()
+                todo.append((_IN_ITEM, op, left, limit, []))
+                mode = _OPERAND
+            elif op in ("is", "is_not"):
+                self.expect_word("null")
+                left = Call("missing" if op == "is" else "exists", left, {})
+                if self.operator_follows():
+                    # THE GRAMMAR APPLIES THE OPERATOR TO THE null, NOT TO THE is
+                    raise Bail()
+            elif op in ("like", "not_like"):
+                todo.append((_LIKE, op, left, limit))
+                limit, mode = precedence, _EXPRESSION
+            else:
+                todo.append((_BINARY, op, left, limit))
+                limit, mode = precedence, _EXPRESSION
+
+
+# WHAT expression() IS DOING
+_EXPRESSION, _OPERAND, _VALUE, _LOOP = "expression", "operand", "value", "loop"
+# WHAT IS WAITING FOR A VALUE ON THE expression() STACK
+_RETURN, _OPERAND_OF, _NOT, _BINARY, _LOW, _HIGH, _LIKE, _PAREN, _ARG, _IN_ITEM = (
+    "return",
+    "operand of",
+    "not",
+    "binary",
+    "low",
+    "high",
+    "like",
+    "paren",
+    "arg",
+    "in item",
+)
+
+
+def _in_list(values):
+    """
+    :return: THE in LIST, AS THE GRAMMAR'S to_tuple_call() WOULD EMIT IT
+    """
+    from mo_sql_parsing.utils import as_literal, number_types
+
+    if len(values) == 1:
+        return values[0]
+    if all(isinstance(v, number_types) for v in values):
+        return values
+    candidate = [as_literal(v) for v in values]
+    if all(candidate):
+        return {"literal": candidate}
+    return values
+
+
+def _is_special(lowered):
+    if "." in lowered:
+        return any(part in special_words for part in lowered.split("."))
+    return lowered in special_words
+
+
+def _binary_call(op, left, right):
+    from mo_sql_parsing.utils import Call
+
+    if op in _associative:
+        if isinstance(left, Call) and left.op == op:
+            # left WAS BUILT BY THIS PARSER, SO IT CAN BE EXTENDED IN PLACE; LONG CHAINS STAY LINEAR
+            args = left.args
+        else:
+            args = [left]
+        if isinstance(right, Call) and right.op == op:
+            args.extend(right.args)
+        else:
+            args.append(right)
+        return Call(op, args, {})
+    return Call(op, [left, right], {})
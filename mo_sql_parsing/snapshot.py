@@ -0,0 +1,164 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# KEEP THE FINALIZED GRAMMAR ON DISK, SO NEW PROCESSES CAN LOAD IT INSTEAD OF BUILDING IT
+#
+# THE GRAMMAR IS FULL OF LAMBDAS AND CLOSURES, SO cloudpickle IS REQUIRED TO WRITE (AND READ) A SNAPSHOT.
+# WITHOUT IT, OR WITHOUT A SNAPSHOT DIRECTORY, THE GRAMMAR IS BUILT AS USUAL.
+#
+# LOADING A PICKLE RUNS CODE, SO WHOEVER CAN WRITE A SNAPSHOT (OR SET MO_SQL_PARSING_SNAPSHOT) CAN RUN CODE IN
+# THIS PROCESS.  A SNAPSHOT IS ONLY LOADED IF IT IS OWNED BY THE CURRENT USER, AND NOT WRITABLE BY ANYONE ELSE;
+# STILL, ONLY POINT MO_SQL_PARSING_SNAPSHOT AT A DIRECTORY YOU TRUST.
+#
+import hashlib
+import os
+import pickle
+import stat
+import sys
+
+SNAPSHOT_DIRECTORY = "MO_SQL_PARSING_SNAPSHOT"  # ENVIRONMENT VARIABLE
+directory = os.environ.get(SNAPSHOT_DIRECTORY)  # WHERE SNAPSHOTS ARE KEPT, None TO DISABLE
+
+_grammar_sources = [
+    "infix.py",
+    "keywords.py",
+    "memo.py",
+    "operators.py",
+    "sql_parser.py",
+    "types.py",
+    "utils.py",
+    "windows.py",
+    "snapshot.py",
+]
+_version = None
+
+
+def _shared():
+    # OBJECTS COMPARED BY IDENTITY DURING PARSING; THEY ARE REFERENCED, NOT COPIED INTO THE SNAPSHOT
+    from mo_sql_parsing import utils
+
+    return {"SQL_NULL": utils.SQL_NULL}
+
+
+def _dist_version(name):
+    from importlib import metadata
+
+    try:
+        return metadata.version(name)
+    except Exception:
+        return "dev"
+
+
+def snapshot_version():
+    """
+    :return: KEY THAT CHANGES WHEN THE PACKAGE VERSION, THE GRAMMAR SOURCE, OR THE PYTHON VERSION CHANGES
+    """
+    global _version
+    if _version:
+        return _version
+
+    digest = hashlib.sha256()
+    for v in (sys.version, _dist_version("mo-sql-parsing"), _dist_version("mo-parsing")):
+        digest.update(v.encode("utf8"))
+    here = os.path.dirname(__file__)
+    for name in _grammar_sources:
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    _version = digest.hexdigest()[:16]
+    return _version
+
+
+def snapshot_path(dialect):
+    from mo_sql_parsing import infix
+
+    # THE infix FLAG CHANGES THE GRAMMAR, NOT ITS SOURCE
+    kind = "-infix" if infix.enabled else ""
+    return os.path.join(directory, f"{dialect}{kind}-{snapshot_version()}.grammar")
+
+
+def load(dialect):
+    """
+    :return: THE SNAPSHOT GRAMMAR, OR None IF THERE IS NO (USABLE, TRUSTED) SNAPSHOT
+    """
+    if not directory:
+        return None
+    shared = _shared()
+
+    class Unpickler(pickle.Unpickler):
+        def persistent_load(self, pid):
+            return shared[pid]
+
+    try:
+        fd = os.open(snapshot_path(dialect), os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0))
+    except OSError:
+        # MISSING, OR STALE
+        return None
+    with os.fdopen(fd, "rb") as f:
+        if not is_trusted(os.fstat(f.fileno())):
+            return None
+        try:
+            return Unpickler(f).load()
+        except Exception:
+            # cloudpickle NOT INSTALLED, OR BROKEN
+            return None
+
+
+def is_trusted(status):
+    """
+    :param status: os.stat_result OF A SNAPSHOT
+    :return: True IF THE SNAPSHOT MAY BE LOADED: A FILE OWNED BY THE CURRENT USER, THAT NO ONE ELSE CAN WRITE
+    """
+    if not stat.S_ISREG(status.st_mode):
+        return False
+    if hasattr(os, "getuid") and status.st_uid != os.getuid():
+        return False
+    return not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def save(dialect, parser):
+    """
+    WRITE parser TO THE SNAPSHOT DIRECTORY
+    """
+    try:
+        import cloudpickle
+    except ImportError:
+        raise Exception("Please `pip install cloudpickle` to save grammar snapshots") from None
+
+    shared = {id(v): k for k, v in _shared().items()}
+
+    class Pickler(cloudpickle.CloudPickler):
+        def persistent_id(self, obj):
+            return shared.get(id(obj))
+
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    path = snapshot_path(dialect)
+    temp = f"{path}.{os.getpid()}.tmp"
+    # ONLY THE OWNER MAY WRITE A SNAPSHOT (SEE is_trusted)
+    fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o600)
+    with os.fdopen(fd, "wb") as f:
+        Pickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(parser)
+    os.replace(temp, path)  # OTHER PROCESSES NEVER SEE A PARTIAL SNAPSHOT
+
+
+def load_or_build(dialect, builder):
+    """
+    :param dialect: name of the grammar
+    :param builder: function that builds the grammar
+    :return: grammar from the snapshot, or built (and saved) if there is no snapshot
+    """
+    if not directory:
+        return builder()
+    output = load(dialect)
+    if output is None:
+        output = builder()
+        try:
+            save(dialect, output)
+        except Exception:
+            # READ-ONLY FILESYSTEM, OR NO cloudpickle; PARSING STILL WORKS
+            pass
+    return output
@@ -7,9 +7,10 @@
 # Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
 #
 from mo_parsing import debug, Null
+from mo_parsing import infix_notation as parsing_infix_notation
 from mo_parsing.whitespaces import NO_WHITESPACE, Whitespace
 
-from mo_sql_parsing import utils
+from mo_sql_parsing import infix, utils
 from mo_sql_parsing.keywords import *
 from mo_sql_parsing.types import get_column_type, time_functions, _sizes
 from mo_sql_parsing.utils import *
@@ -17,7 +18,7 @@ from mo_sql_parsing.windows import window
 
 
 def common_parser():
-    atomic_ident = ansi_ident | mysql_backtick_ident | simple_ident
+    atomic_ident = Dispatch([ansi_ident, mysql_backtick_ident, simple_ident])
     return parser(regex_string | ansi_string, atomic_ident)
 
 
@@ -25,12 +26,12 @@ def mysql_parser():
     utils.emit_warning_for_double_quotes = False
 
     mysql_string = regex_string | ansi_string | mysql_doublequote_string
-    atomic_ident = mysql_backtick_ident | sqlserver_ident | ident_w_dash
+    atomic_ident = Dispatch([mysql_backtick_ident, sqlserver_ident, ident_w_dash])
     return parser(mysql_string, atomic_ident)
 
 
 def sqlserver_parser():
-    atomic_ident = ansi_ident | mysql_backtick_ident | sqlserver_ident | simple_ident
+    atomic_ident = Dispatch([ansi_ident, mysql_backtick_ident, sqlserver_ident, simple_ident])
     return parser(regex_string | ansi_string, atomic_ident, sqlserver=True)
 
 
@@ -38,7 +39,10 @@ def parser(literal_string, simple_ident, sqlserver=False):
     debugger = debug.DEBUGGER or Null
     debugger.__exit__(None, None, None)
 
-    ident = Combine(delimited_list(simple_ident, separator=".", combine=True))
+    # THE mo_parsing VERSION, UNLESS infix.enable() WAS CALLED
+    infix_notation = infix.infix_notation if infix.enabled else parsing_infix_notation
+
+    ident = Memo(Combine(delimited_list(simple_ident, separator=".", combine=True)))
 
     with Whitespace() as white:
         rest_of_line = Regex(r"[^\n]*")
@@ -48,7 +52,7 @@ def parser(literal_string, simple_ident, sqlserver=False):
         white.add_ignore(Literal("/*") + SkipTo("*/", include=True))
 
         with whitespaces.NO_WHITESPACE:
-            identifier = ~RESERVED + ident
+            identifier = NotReserved(RESERVED) + ident
         function_name = ~(UNION | FROM | WHERE | SELECT) + ident
 
         # EXPRESSIONS
@@ -73,7 +77,7 @@ def parser(literal_string, simple_ident, sqlserver=False):
             + END
         ) / to_switch_call
 
-        casting = MatchFirst([
+        casting = WordDispatch([
             (
                 Group(Keyword(c, caseless=True)("op") + LB + expression("params") + Optional(AS | comma) + column_type("params") + RB)
                 / to_json_call
@@ -109,15 +113,13 @@ def parser(literal_string, simple_ident, sqlserver=False):
         # INTERVAL TYPE
         # https://www.postgresql.org/docs/current/datatype-datetime.html
         time_interval_type = Forward()
-        time_interval_type << MatchFirst([
-            (
-                (CaselessLiteral(d) / (lambda t: durations[t[0].lower()]))("op")
-                + _sizes
-                + Optional(TO + time_interval_type("kwargs"))
-            )
-            / to_interval_type
-            for d in durations.keys()
-        ])
+        # ONE REGEX MATCHES THE FIRST OF durations THE TEXT STARTS WITH (A PREFIX, NOT A WHOLE WORD)
+        duration = Regex("(?i:" + "|".join(re.escape(d) for d in durations) + ")")
+        time_interval_type << (
+            (duration / (lambda t: durations[t[0].lower()]))("op")
+            + _sizes
+            + Optional(TO + time_interval_type("kwargs"))
+        ) / to_interval_type
 
         def matching(type):
             return Optional(
@@ -294,35 +296,42 @@ def parser(literal_string, simple_ident, sqlserver=False):
             scale_function = ((real_num | int_num) + call_function) / scale
             scale_ident = ((real_num | int_num) + ident) / scale
 
-        compound = (
-            NULL
-            | TRUE
-            | FALSE
-            | NOCASE
-            | interval
-            | timestamp
-            | extract
-            | case
-            | switch
-            | casting
-            | substring
-            | distinct
-            | trim
-            | stack
-            | create_array
-            | create_map
-            | create_struct
-            | (LB + Group(query) + RB)
-            | (LB + Group(delimited_list(expression)) / to_tuple_call + RB)
-            | literal_string
-            | hex_num
-            | scale_function
-            | scale_ident
-            | real_num
-            | int_num
-            | call_function
-            | Combine(function_name + Optional(".*"))
-        )
+        # A PARENTHESISED QUERY STARTS WITH ONE OF THESE KEYWORDS; LOOK BEFORE TRYING ONE ON EVERY (expression)
+        subquery_start = FollowedBy(Regex(
+            r"\((?:\s|\(|--[^\n]*|\#[^\n]*|/\*(?:[^*]|\*(?!/))*\*/)*(?i:select|with|values)(?![0-9A-Za-z_$])"
+        ))
+
+        compound = Dispatch([
+            NULL,
+            TRUE,
+            FALSE,
+            NOCASE,
+            SimpleInterval(durations),  # THE COMMON FORMS OF interval, WITHOUT ITS LONGEST-MATCH SEARCH
+            interval,
+            timestamp,
+            extract,
+            case,
+            switch,
+            casting,
+            substring,
+            distinct,
+            trim,
+            stack,
+            create_array,
+            create_map,
+            create_struct,
+            literal_list,
+            (subquery_start + LB + Group(query) + RB),
+            (LB + Group(delimited_list(expression)) / to_tuple_call + RB),
+            literal_string,
+            hex_num,
+            scale_function,
+            scale_ident,
+            real_num,
+            int_num,
+            call_function,
+            Combine(function_name + Optional(".*")),
+        ])
 
         window_clause, over_clause = window(expression, identifier, sort_column)
 
@@ -572,7 +581,14 @@ def parser(literal_string, simple_ident, sqlserver=False):
             | table_def_foreign_key("foreign_key")
         )
 
-        table_element = table_constraint_definition("constraint") | column_definition("columns")
+        # A TABLE CONSTRAINT STARTS WITH ONE OF ITS KEYWORDS, A NAME AND "(", OR "("; LOOK BEFORE TRYING ONE ON
+        # EVERY COLUMN, BECAUSE A FAILED ATTEMPT IS EXPENSIVE
+        constraint_start = FollowedBy(Regex(
+            r"(?i:constraint|primary|unique|index|key|check|foreign)(?![\w$@])"
+            r"|(?:\"(?:\"\"|[^\"])*\"|`(?:``|[^`])*`|\[(?:\]\]|[^\]])*\]|[\w$@.])*"
+            r"(?:[ \t\n\r]+|--[^\n]*|\#[^\n]*|/\*(?:[^*]|\*(?!/))*\*/)*\("
+        ))
+        table_element = (constraint_start + table_constraint_definition)("constraint") | column_definition("columns")
         temporary = Optional(
             (Keyword("temporary", caseless=True) | Keyword("temp", caseless=True))("temporary") / True
         ) + Optional(flag("transient"))
@@ -910,6 +926,8 @@ def parser(literal_string, simple_ident, sqlserver=False):
 
         debugger.__enter__()
 
+        # mo_parsing TURNS THESE ALTERNATIVES INTO A LOOKUP ON THEIR LEADING KEYWORDS, SO A STATEMENT IS ONLY
+        # MATCHED AGAINST THE FEW THAT START WITH ITS FIRST WORD; KEEP EACH ONE STARTING WITH A KEYWORD
         statement << (
             query
             | (insert | update | delete | merge | truncate)
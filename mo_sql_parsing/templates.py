@@ -0,0 +1,202 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# OPT-IN CACHE OF PARSE TREES BY QUERY SHAPE: `WHERE id = 123` AND `WHERE id = 456` SHARE ONE PARSE
+#
+#     from mo_sql_parsing import templates
+#     templates.enable(size=10000)
+#
+# THE LITERALS (STRINGS, INTEGERS, REALS, HEX) ARE REPLACED WITH SENTINEL VALUES OF THE SAME KIND, AND THE
+# RESULTING TEMPLATE IS PARSED.  EVERY SENTINEL MUST COME OUT OF THE PARSE UNCHANGED, EXACTLY ONCE, AND THE
+# FIRST QUERY OF EACH SHAPE IS ALSO PARSED IN FULL TO CONFIRM THE RE-BOUND TREE IS THE SAME.  OTHERWISE, THE
+# TEMPLATE IS MARKED AS NOT CACHEABLE, AND QUERIES OF THAT SHAPE ARE PARSED IN FULL.
+#
+# THE GRAMMAR LOOKS INSIDE INTERVAL LITERALS (eg INTERVAL '1 day'), SO THOSE STAY IN THE TEMPLATE.
+#
+import re
+
+from mo_sql_parsing.cache import ParseCache
+
+template_cache = None  # THE ParseCache OF TEMPLATES USED BY parse*(), None TO DISABLE
+
+NOT_CACHEABLE = False  # CACHED FOR TEMPLATES THAT CAN NOT BE RE-BOUND
+INT_BASE = 3_141_592_653_000
+REAL_BASE = 2_718_281_828_000
+
+_skip = r"""(?i:interval)(?![\w$@])\s*(?:'(?:''|[^'])*'|[\d.]+)?|--[^\n]*|\#[^\n]*|/\*.*?\*/|"(?:""|[^"])*"|`(?:``|[^`])*`|[^\W\d][\w$@]*(?:'(?:''|[^'])*')?|[$@][\w$@]*"""
+_literals = r"""
+    |(?P<string>'(?:''|[^'])*')
+    |(?P<hex>0x[0-9a-fA-F]+)(?![\w$@])
+    |(?<![\w$@.])(?P<real>(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?)(?![\w$@.])
+    |(?<![\w$@.])(?P<int>\d+(?:[eE]\+?\d+)?)(?![\w$@.])
+    |\d[\w$@.]*
+"""
+# QUOTED IDENTIFIERS, COMMENTS AND PREFIXED STRINGS (eg r'..', N'..') ARE PART OF THE TEMPLATE
+ansi_literals = re.compile(f"(?:{_skip}){_literals}", re.DOTALL | re.VERBOSE)
+sqlserver_literals = re.compile(f"(?:{_skip}|\\[(?:\\]\\]|[^\\]])*\\]){_literals}", re.DOTALL | re.VERBOSE)
+
+
+def to_template(sql, dialect):
+    """
+    :return: (template, literals) PAIR, WHERE literals IS A LIST OF (kind, text) PAIRS
+    """
+    pattern = sqlserver_literals if dialect == "sqlserver" else ansi_literals
+    acc = []
+    literals = []
+    end = 0
+    for match in pattern.finditer(sql):
+        kind = match.lastgroup
+        if not kind:
+            continue
+        start = match.start(kind)
+        acc.append(sql[end:start])
+        acc.append(_sentinel_text(kind, len(literals)))
+        literals.append((kind, match.group(kind)))
+        end = match.end(kind)
+    if not literals:
+        return sql, literals
+    acc.append(sql[end:])
+    return "".join(acc), literals
+
+
+def _sentinel_text(kind, index):
+    if kind == "string":
+        return f"'\x1f{index}\x1f'"
+    elif kind == "int":
+        return str(INT_BASE + index)
+    elif kind == "real":
+        return f"{REAL_BASE + index}.5"
+    else:
+        return f"0xFEED{index:08X}"
+
+
+def _sentinel_values(literals):
+    """
+    :return: map from (type, value), AS FOUND IN THE PARSE TREE, TO (index, negated)
+    """
+    output = {}
+    for index, (kind, _) in enumerate(literals):
+        if kind == "string":
+            output[(str, f"\x1f{index}\x1f")] = index, False
+        elif kind == "int":
+            output[(int, INT_BASE + index)] = index, False
+            output[(int, -(INT_BASE + index))] = index, True
+        elif kind == "real":
+            output[(float, REAL_BASE + index + 0.5)] = index, False
+            output[(float, -(REAL_BASE + index + 0.5))] = index, True
+        else:
+            output[(str, f"FEED{index:08X}")] = index, False
+    return output
+
+
+def _literal_values(literals):
+    from mo_sql_parsing.utils import parse_int, single_literal
+
+    output = []
+    for kind, text in literals:
+        if kind == "string":
+            output.append(single_literal([text])["literal"])
+        elif kind == "int":
+            output.append(parse_int([text]))
+        elif kind == "real":
+            output.append(float(text))
+        else:
+            output.append(text[2:])
+    return output
+
+
+def find_sentinels(tree, literals):
+    """
+    :return: list of (path, index, negated) FOR EACH LITERAL IN THE tree, OR None IF THE LITERALS DID NOT SURVIVE THE PARSE
+    """
+    sentinels = _sentinel_values(literals)
+    output = []
+    todo = [((), tree)]
+    while todo:
+        path, node = todo.pop()
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            continue
+        for k, v in items:
+            if isinstance(v, (dict, list)):
+                todo.append((path + (k,), v))
+            else:
+                try:
+                    found = sentinels.get((type(v), v))
+                except TypeError:
+                    continue
+                if found:
+                    output.append((path + (k,), *found))
+    if sorted(index for _, index, _ in output) != list(range(len(literals))):
+        return None
+    return output
+
+
+def bind(tree, paths, literals):
+    """
+    SET THE LITERAL VALUES INTO THE (FRESH) TEMPLATE PARSE TREE
+    """
+    values = _literal_values(literals)
+    for path, index, negated in paths:
+        node = tree
+        for k in path[:-1]:
+            node = node[k]
+        value = values[index]
+        node[path[-1]] = -value if negated else value
+    return tree
+
+
+def parse(template_cache, parse_string, parser, dialect, sql, null, calls):
+    """
+    PARSE sql USING THE CACHED PARSE OF ITS TEMPLATE, IF POSSIBLE
+    :param parse_string: function that does the full parse
+    """
+    template, literals = to_template(sql, dialect)
+    key = template_cache.key(dialect, template, null, calls)
+    if key is None:
+        return parse_string(parser, dialect, sql, null, calls)
+    entry = template_cache.get(key)
+    if entry is None:
+        output = parse_string(parser, dialect, sql, null, calls)
+        try:
+            tree = parse_string(parser, dialect, template, null, calls)
+            paths = find_sentinels(tree, literals)
+        except Exception:
+            paths = None
+        if paths is None:
+            template_cache.add(key, NOT_CACHEABLE)
+        else:
+            template_cache.add(key, (tree, paths))
+            if bind(tree, paths, literals) != output:
+                # THE LITERAL VALUES CHANGE THE SHAPE OF THE PARSE
+                template_cache.add(key, NOT_CACHEABLE)
+        return output
+    elif entry is NOT_CACHEABLE:
+        return parse_string(parser, dialect, sql, null, calls)
+    tree, paths = entry
+    return bind(tree, paths, literals)
+
+
+def enable(size=1000, max_bytes=64 * 1024 * 1024):
+    """
+    START CACHING PARSE TREES BY TEMPLATE
+    :param size: maximum number of cached templates
+    :param max_bytes: maximum (marshal-ed) size of all cached template parse trees
+    :return: the ParseCache, for its stats()
+    """
+    global template_cache
+    template_cache = ParseCache(size, max_bytes)
+    return template_cache
+
+
+def disable():
+    global template_cache
+    template_cache = None
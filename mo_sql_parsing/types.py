@@ -14,7 +14,6 @@ from mo_parsing import (
     Forward,
     Group,
     Optional,
-    MatchFirst,
     Literal,
     ZeroOrMore,
     set_parser_names,
@@ -40,7 +39,7 @@ from mo_sql_parsing.keywords import (
     AS,
 )
 from mo_sql_parsing.utils import keyword, to_json_call, int_num, ansi_string, ansi_ident, assign, flag, simple_ident, \
-    to_flat_column_type
+    to_flat_column_type, WordDispatch
 
 _size = Optional(LB + int_num("params") + RB)
 _char_set = Optional(assign("character set", simple_ident))
@@ -130,7 +129,8 @@ TIMESTAMP_W_TIMEZONE_TYPE = (TIMESTAMP_W_TIMEZONE("op") + _format) / to_json_cal
 TIMESTAMPTZ_TYPE = (TIMESTAMPTZ("op") + _format) / to_json_call
 TIMETZ_TYPE = (TIMETZ("op") + _format) / to_json_call
 
-simple_types << MatchFirst([
+# MANY TYPES START WITH THE SAME LETTERS (int, int32, int64, integer, interval), SO LOOK UP THE WHOLE WORD
+simple_types << WordDispatch([
     ARRAY_TYPE,
     BIGINT,
     BIT,
@@ -213,7 +213,7 @@ def get_column_type(expr, identifier, literal_string):
         )
     ) / to_json_call
 
-    column_type << (struct_type | row_type | array_type | simple_types)("type") + Optional(
+    column_type << WordDispatch([struct_type, row_type, array_type, simple_types])("type") + Optional(
         AS + LB + expr("value") + RB
     )
 
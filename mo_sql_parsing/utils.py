@@ -8,15 +8,20 @@
 #
 
 import ast
+import re
 import sys
 
-from mo_dots import is_data, is_null, Data, from_data, literal_field, unliteral_field
+from mo_dots import is_data, is_null, literal_field, unliteral_field
 from mo_future import text, number_types, binary_type, flatten, first
 from mo_imports import expect
 from mo_parsing import *
 from mo_parsing import whitespaces
+from mo_parsing.enhancement import ParseEnhancement
 from mo_parsing.utils import is_number, listwrap
 
+from mo_sql_parsing import memo
+from mo_sql_parsing.operators import binary_ops, is_set_op, normal_op, reserved_words, simple_op
+
 unary_ops = expect("unary_ops")
 
 
@@ -36,8 +41,238 @@ class Call(object):
 IDENT_CHAR = Regex("[@_$0-9A-Za-zÀ-ÖØ-öø-ƿ]").expr.parser_config.include
 FIRST_IDENT_CHAR = "".join(set(IDENT_CHAR) - set("0123456789"))
 SQL_NULL = Call("null", [], {})
+KEYWORD_WORD = re.compile(r"[0-9A-Za-z_$]+")  # THE WORD A Keyword MATCHES (SEE whitespaces.CURRENT.keyword_chars)
+
+
+class NotReserved(NotAny):
+    """
+    SAME AS ~RESERVED, BUT LOOK UP THE WORD IN reserved_words, RATHER THAN TRY EVERY RESERVED KEYWORD
+    """
+
+    __slots__ = []
+
+    def parse_impl(self, string, start, do_actions=True):
+        found = KEYWORD_WORD.match(string, start)
+        if found and found.group().lower() in reserved_words:
+            raise ParseException(self, start, string)
+        return ParseResults(self, start, start, [], [])
 
-null_locations = []
+
+parse_state = memo.state  # THE PARSE RUNNING ON THIS THREAD
+describe_limit = 10000  # LONGER STATEMENTS ARE NOT PARSED AGAIN TO DESCRIBE THEIR FAILURE (SEE describe_failure)
+
+
+def describe_failure(parser, sql):
+    """
+    Dispatch SKIPS THE exprs THAT CAN NOT MATCH, SO IT COLLECTS FEWER FAILURES THAN MatchFirst, AND THE ERROR
+    IT RAISES NAMES OTHER PARSERS.  PARSE AGAIN, ON THIS THREAD ONLY, TRYING EVERYTHING, TO GET THE ERROR THE
+    GRAMMAR DESCRIBES.  THIS DOUBLES THE COST OF A FAILED PARSE, SO IT IS ONLY DONE UP TO describe_limit CHARACTERS
+    :param parser: THE PARSER THAT FAILED ON sql
+    :param sql: THE TEXT
+    :return: THE ParseException TO RAISE, OR None TO RAISE THE ORIGINAL
+    """
+    if len(sql) > describe_limit:
+        return None
+    previous_exhaustive = parse_state.exhaustive
+    parse_state.exhaustive = True
+    previous_memo = memo.begin()  # MEMOIZED RESULTS HOLD THE FAILURES OF THE FIRST PARSE
+    try:
+        parser.parse_string(sql, parse_all=True)
+    except ParseException as cause:
+        return cause
+    finally:
+        memo.end(previous_memo)
+        parse_state.exhaustive = previous_exhaustive
+    return None
+
+
+class Dispatch(ParseExpression):
+    """
+    SAME AS MatchFirst(exprs), BUT ONLY TRIES THE exprs THAT CAN START WITH THE TEXT AT THE PARSE POSITION: THOSE
+    WITH AN expecting() PREFIX OF IT, AND THOSE THAT DO NOT SAY WHAT THEY EXPECT (IN THE ORDER GIVEN)
+    """
+
+    __slots__ = ["lookup", "match_first"]
+
+    def __init__(self, exprs):
+        ParseExpression.__init__(self, exprs)
+        self.lookup = None
+        self.match_first = None
+
+    def copy(self):
+        output = ParseExpression.copy(self)
+        output.lookup = self.lookup
+        output.match_first = self.match_first
+        return output
+
+    def __or__(self, other):
+        # LIKE MatchFirst, EXTEND RATHER THAN NEST, SO expected() IS THE SAME AS THE MatchFirst IT REPLACES
+        if other is Ellipsis or self.is_annotated():
+            return ParseExpression.__or__(self, other)
+        return self.__class__(self.exprs + [whitespaces.CURRENT.normalize(other)])
+
+    def expected(self):
+        """
+        :return: THE MatchFirst THIS STANDS FOR (SEE describe_failure)
+        """
+        if self.match_first is None:
+            self.match_first = MatchFirst(list(self._flat_exprs())).streamline()
+        return self.match_first
+
+    def parse_exhaustive(self, string, start, do_actions):
+        try:
+            result = self.expected().parse_impl(string, start, do_actions)
+        except ParseException as cause:
+            raise ParseException(self, start, string, cause=cause.unsorted_cause) from None
+        return ParseResults(self, result.start, result.end, result.tokens, result.failures)
+
+    def _flat_exprs(self):
+        # MatchFirst MERGES THE MatchFirsts IT HOLDS; DO THE SAME FOR THE Dispatches THAT STAND FOR THEM
+        for e in self.exprs:
+            if isinstance(e, Dispatch) and not e.is_annotated():
+                yield from e._flat_exprs()
+            else:
+                yield e
+
+    def _min_length(self):
+        return min(e.min_length() for e in self.exprs)
+
+    @property
+    def whitespace(self):
+        return [e.whitespace for e in self.exprs]
+
+    def expecting(self):
+        return {}
+
+    def check_recursion(self, seen=()):
+        seen_more = seen + (self,)
+        for e in self.exprs:
+            e.check_recursion(seen_more)
+
+    def _build_lookup(self):
+        # BUILT ON FIRST USE, ONCE THE Forwards IN exprs ARE DEFINED
+        prefixes = []  # (expr, lower-case prefixes), OR (expr, None) IF IT MAY START WITH ANYTHING
+        for e in self.exprs:
+            keys = e.expecting()
+            prefixes.append((e, tuple(sorted({k.lower() for k in keys})) if keys else None))
+        default = [(e, None) for e, keys in prefixes if keys is None]
+        by_first = {}
+        for e, keys in prefixes:
+            for k in keys or ():
+                by_first.setdefault(k[0], None)
+        for c in by_first:
+            by_first[c] = [
+                (e, keys if keys is None else tuple(k for k in keys if k[0] == c))
+                for e, keys in prefixes
+                if keys is None or any(k[0] == c for k in keys)
+            ]
+        width = max((len(k) for _, keys in prefixes for k in keys or ()), default=1)
+        self.lookup = by_first, default, width
+        return self.lookup
+
+    def parse_impl(self, string, start, do_actions=True):
+        if parse_state.exhaustive:
+            return self.parse_exhaustive(string, start, do_actions)
+        by_first, default, width = self.lookup or self._build_lookup()
+        candidates = by_first.get(string[start : start + 1].lower(), default)
+        head = None
+        failures = []
+        for e, keys in candidates:
+            if keys is not None:
+                if head is None:
+                    head = string[start : start + width].lower()
+                if not head.startswith(keys):
+                    continue
+            try:
+                result = e._parse(string, start, do_actions)
+                failures.extend(result.failures)
+                return ParseResults(self, result.start, result.end, [result], failures)
+            except ParseException as cause:
+                failures.append(cause)
+        raise ParseException(self, start, string, cause=failures)
+
+    def __str__(self):
+        if self.parser_name:
+            return self.parser_name
+        return " | ".join("{" + text(e) + "}" for e in self.exprs)
+
+
+class WordDispatch(Dispatch):
+    """
+    SAME AS MatchFirst(exprs), FOR exprs THAT START WITH A KEYWORD: ONLY TRIES THE exprs THAT START WITH THE WORD AT
+    THE PARSE POSITION (int DOES NOT TRY integer, int64, interval...), AND THOSE THAT DO NOT SAY WHAT THEY EXPECT
+    """
+
+    __slots__ = []
+
+    def expecting(self):
+        output = {}
+        for e in self.exprs:
+            keys = e.expecting()
+            if not keys:
+                return {}
+            for k in keys:
+                output[k] = [self]
+        return output
+
+    def _build_lookup(self):
+        prefixes = []  # (expr, lower-case words), OR (expr, None) IF IT MAY START WITH ANYTHING
+        for e in self.exprs:
+            keys = {k.lower() for k in e.expecting()}
+            if keys and all(KEYWORD_WORD.fullmatch(k) for k in keys):
+                prefixes.append((e, keys))
+            else:
+                prefixes.append((e, None))
+        by_word = {}
+        for _, words in prefixes:
+            for w in words or ():
+                by_word[w] = [e for e, ww in prefixes if ww is None or w in ww]
+        default = [e for e, words in prefixes if words is None]
+        self.lookup = by_word, default
+        return self.lookup
+
+    def parse_impl(self, string, start, do_actions=True):
+        if parse_state.exhaustive:
+            return self.parse_exhaustive(string, start, do_actions)
+        by_word, default = self.lookup or self._build_lookup()
+        found = KEYWORD_WORD.match(string, start)
+        candidates = by_word.get(found.group().lower(), default) if found else default
+        failures = []
+        for e in candidates:
+            try:
+                result = e._parse(string, start, do_actions)
+                failures.extend(result.failures)
+                return ParseResults(self, result.start, result.end, [result], failures)
+            except ParseException as cause:
+                failures.append(cause)
+        raise ParseException(self, start, string, cause=failures)
+
+
+class Memo(ParseEnhancement):
+    """
+    SAME AS expr, BUT WHAT IT MATCHES (OR FAILS TO MATCH) AT EACH POSITION IS KEPT FOR THE REST OF THE PARSE
+    (SEE memo.py)
+    """
+
+    __slots__ = []
+
+    def parse_impl(self, string, start, do_actions=True):
+        table = parse_state.table
+        if table is None:
+            return ParseEnhancement.parse_impl(self, string, start, do_actions)
+
+        key = self.expr, start, do_actions  # NAMED COPIES, LIKE ident("name"), SHARE THE SAME expr
+        result = table.get(key)
+        if result is None:
+            try:
+                result = self.expr._parse(string, start, do_actions)
+                table.add(key, result, len(result.failures))
+            except ParseException as cause:
+                result = cause
+                table.add(key, cause, len(listwrap(cause.unsorted_cause)))
+        if isinstance(result, ParseException):
+            raise result
+        return ParseResults(self, result.start, result.end, [result], result.failures)
 
 
 def keyword(keywords):
@@ -57,82 +292,105 @@ def assign(key: str, value: ParserElement):
     return keyword(key).suppress() + value(key.replace(" ", "_"))
 
 
-def simple_op(op, args, kwargs):
-    if args is None:
-        kwargs[op] = {}
-    else:
-        kwargs[op] = args
-    return kwargs
-
-
-def normal_op(op, args, kwargs):
-    output = Data(op=op)
-    args = listwrap(args)
-    if args and (not isinstance(args[0], dict) or args[0]):
-        output.args = args
-    if kwargs:
-        output.kwargs = kwargs
-    return from_data(output)
-
-
-scrub_op = simple_op
-
+_VISIT, _CALL, _LIST, _DICT = range(4)  # WHAT scrub() DOES WITH THE NEXT ITEM OF ITS STACK
 
-def scrub(result):
-    if result is SQL_NULL:
-        return SQL_NULL
-    elif result == None:
-        return None
-    elif isinstance(result, text):
-        return result
-    elif isinstance(result, binary_type):
-        return result.decode("utf8")
-    elif isinstance(result, number_types):
-        return result
-    elif isinstance(result, Call):
-        kwargs = scrub(result.kwargs)
-        args = scrub(result.args)
-        if args is SQL_NULL:
-            null_locations.append((kwargs, result.op))
-        return scrub_op(result.op, args, kwargs)
-    elif isinstance(result, dict) and not result:
-        return result
-    elif isinstance(result, list):
-        output = [rr for r in result for rr in [scrub(r)]]
 
-        if not output:
-            return None
-        elif len(output) == 1:
-            return output[0]
+def scrub(result, calls=simple_op, null=SQL_NULL):
+    """
+    CONVERT ParseResults INTO JSON-IZABLE STRUCTURE
+    THE TREE IS WALKED WITH AN EXPLICIT STACK, SO DEEP TREES DO NOT HIT THE RECURSION LIMIT
+    :param result: the ParseResults (or part of it)
+    :param calls: function used to emit the function calls (simple_op or normal_op)
+    :param null: what replaces SQL_NULL in the containers emitted (the default leaves SQL_NULL in place)
+    :return: JSON-IZABLE STRUCTURE
+    """
+    root = [None]
+    # EACH ITEM IS (action, value, parent, key): THE SCRUBBED value GOES IN parent[key]
+    todo = [(_VISIT, result, root, 0)]
+    push, pop = todo.append, todo.pop
+    while todo:
+        action, result, parent, key = pop()
+        if action is _VISIT:
+            if result.__class__ is ParseResults:
+                # AN EMPTY ParseResults IS None TOO, BUT COMPARING IT WITH None IS SLOW
+                kv_pairs = list(result.items())
+                if not kv_pairs:
+                    result = list(result)
+            elif result is SQL_NULL:
+                parent[key] = SQL_NULL
+                continue
+            elif result == None:
+                parent[key] = None
+                continue
+            elif isinstance(result, text):
+                parent[key] = result
+                continue
+            elif isinstance(result, binary_type):
+                parent[key] = result.decode("utf8")
+                continue
+            elif isinstance(result, number_types):
+                parent[key] = result
+                continue
+            elif isinstance(result, Call):
+                scrubbed = [None, None]  # kwargs, args
+                push((_CALL, (result.op, scrubbed), parent, key))
+                push((_VISIT, result.args, scrubbed, 1))
+                push((_VISIT, result.kwargs, scrubbed, 0))
+                continue
+            elif isinstance(result, dict) and not result:
+                parent[key] = result
+                continue
+            elif isinstance(result, list):
+                kv_pairs = None
+            else:
+                # ATTEMPT A DICT INTERPRETATION
+                kv_pairs = list(result.items())
+                if not kv_pairs:
+                    result = list(result)
+
+            if kv_pairs:
+                scrubbed = [None] * len(kv_pairs)
+                push((_DICT, (result, kv_pairs, scrubbed), parent, key))
+                values = (v for _, v in kv_pairs)
+            elif len(result) == 1:
+                push((_VISIT, result[0], parent, key))
+                continue
+            elif not result:
+                parent[key] = None
+                continue
+            else:
+                scrubbed = [None] * len(result)
+                push((_LIST, scrubbed, parent, key))
+                values = result
+            for i, v in enumerate(values):
+                if v.__class__ is str:
+                    scrubbed[i] = v
+                else:
+                    push((_VISIT, v, scrubbed, i))
+        elif action is _CALL:
+            op, (kwargs, args) = result
+            parent[key] = calls(op, args, kwargs)
+            if args is SQL_NULL:
+                kwargs[op] = null
+        elif action is _LIST:
+            if SQL_NULL in result:
+                for i, v in enumerate(result):
+                    if v is SQL_NULL:
+                        result[i] = null
+            parent[key] = result
         else:
-            for i, v in enumerate(output):
+            result, kv_pairs, scrubbed = result
+            output = {}
+            for (k, _), v in zip(kv_pairs, scrubbed):
                 if v is SQL_NULL:
-                    null_locations.append((output, i))
-            return output
-    else:
-        # ATTEMPT A DICT INTERPRETATION
-        try:
-            kv_pairs = list(result.items())
-        except Exception as c:
-            print(c)
-        output = {k: vv for k, v in kv_pairs for vv in [scrub(v)] if not is_null(vv)}
-        if isinstance(result, dict) or output:
-            for k, v in output.items():
-                if v is SQL_NULL:
-                    null_locations.append((output, k))
-            return output
-        return scrub(list(result))
-
-
-def _chunk(values, size):
-    acc = []
-    for v in values:
-        acc.append(v)
-        if len(acc) == size:
-            yield acc
-            acc = []
-    if acc:
-        yield acc
+                    output[k] = null
+                elif not is_null(v):
+                    output[k] = v
+            if isinstance(result, dict) or output:
+                parent[key] = output
+            else:
+                push((_VISIT, list(result), parent, key))
+    return root[0]
 
 
 def to_lambda(tokens):
@@ -193,29 +451,42 @@ def to_json_operator(tokens):
         else:
             return Call("missing", tokens[0], {})
 
-    operands = [tokens[0], tokens[2]]
-    binary_op = Call(op, operands, {})
+    if op not in associative_ops:
+        return Call(op, [tokens[0], tokens[2]], {})
 
-    if op in {"add", "mul", "and", "or", "concat", "binary_and", "binary_or"}:
-        # ASSOCIATIVE OPERATORS
+    # ASSOCIATIVE OPERATORS ARE FLATTENED
+    left, right = (_ungroup(operand) for operand in (tokens[0], tokens[2]))
+    if isinstance(left, Call) and left.op == op and left.args.__class__ is list:
+        # left IS THE CHAIN SO FAR; COPY ITS LIST, left MAY BE SHARED BY A MEMOIZED (OR CACHED) ParseResults
+        acc = list(left.args)
+    else:
         acc = []
-        for operand in operands:
-            while isinstance(operand, ParseResults) and isinstance(operand.type, Group):
-                # PARENTHESES CAUSE EXTRA GROUP LAYERS
-                operand = operand[0]
-                if isinstance(operand, ParseResults) and isinstance(operand.type, Forward):
-                    operand = operand[0]
-
-            if isinstance(operand, Call) and operand.op == op:
-                acc.extend(operand.args)
-            elif isinstance(operand, list):
-                acc.append(operand)
-            elif isinstance(operand, dict) and operand.get(op):
-                acc.extend(operand.get(op))
-            else:
-                acc.append(operand)
-        binary_op = Call(op, acc, {})
-    return binary_op
+        _add_operand(acc, op, left)
+    _add_operand(acc, op, right)
+    return Call(op, acc, {})
+
+
+associative_ops = {"add", "mul", "and", "or", "concat", "binary_and", "binary_or"}
+
+
+def _ungroup(operand):
+    while isinstance(operand, ParseResults) and isinstance(operand.type, Group):
+        # PARENTHESES CAUSE EXTRA GROUP LAYERS
+        operand = operand[0]
+        if isinstance(operand, ParseResults) and isinstance(operand.type, Forward):
+            operand = operand[0]
+    return operand
+
+
+def _add_operand(acc, op, operand):
+    if isinstance(operand, Call) and operand.op == op:
+        acc.extend(operand.args)
+    elif isinstance(operand, list):
+        acc.append(operand)
+    elif isinstance(operand, dict) and operand.get(op):
+        acc.extend(operand.get(op))
+    else:
+        acc.append(operand)
 
 
 def to_offset(tokens):
@@ -239,7 +510,10 @@ def as_literal(token):
 
 def to_tuple_call(token, index, string):
     # IS THIS ONE VALUE IN (), OR MANY?
-    tokens = list(token)
+    return _tuple_of(list(token))
+
+
+def _tuple_of(tokens):
     if len(tokens) == 1:
         return tokens
     if all(isinstance(r, number_types) for r in tokens):
@@ -252,61 +526,6 @@ def to_tuple_call(token, index, string):
     return [tokens]
 
 
-binary_ops = {
-    "::": "cast",
-    "COLLATE": "collate",
-    ":": "get",
-    "||": "concat",
-    "*": "mul",
-    "/": "div",
-    "%": "mod",
-    "+": "add",
-    "-": "sub",
-    "&": "binary_and",
-    "|": "binary_or",
-    "<": "lt",
-    "<=": "lte",
-    ">": "gt",
-    ">=": "gte",
-    "=": "eq",
-    "==": "eq",
-    "is distinct from": "eq!",  # https://sparkbyexamples.com/apache-hive/hive-relational-arithmetic-logical-operators/
-    "is_distinct_from": "eq!",
-    "is not distinct from": "ne!",
-    "is_not_distinct_from": "ne!",
-    "<=>": "eq!",  # https://sparkbyexamples.com/apache-hive/hive-relational-arithmetic-logical-operators/
-    "!=": "neq",
-    "<>": "neq",
-    "not in": "nin",
-    "in": "in",
-    "is_not": "neq",
-    "is": "eq",
-    "similar_to": "similar_to",
-    "like": "like",
-    "rlike": "rlike",
-    "ilike": "ilike",
-    "not like": "not_like",
-    "not_like": "not_like",
-    "not rlike": "not_rlike",
-    "not_rlike": "not_rlike",
-    "not ilike": "not_ilike",
-    "not_ilike": "not_ilike",
-    "not_simlilar_to": "not_similar_to",
-    "or": "or",
-    "and": "and",
-    "->": "lambda",
-    ":=": "assign",
-    "union": "union",
-    "union_all": "union_all",
-    "union all": "union_all",
-    "except": "except",
-    "minus": "minus",
-    "intersect": "intersect",
-}
-
-is_set_op = ("union", "union_all", "except", "minus", "intersect")
-
-
 def to_trim_call(tokens):
     frum = tokens["from"]
     if not frum:
@@ -345,7 +564,7 @@ def to_json_call(tokens):
         for kv in list(more_kwargs):
             kwargs.update(kv)
 
-    return ParseResults(tokens.type, tokens.start, tokens.end, [Call(op, args, kwargs)], tokens.failures,)
+    return ParseResults(tokens.type, tokens.start, tokens.end, [Call(op, args, kwargs)], [])
 
 
 def to_option(tokens):
@@ -468,6 +687,99 @@ def cast_interval_call(tokens, index, string):
     return expr
 
 
+_interval_types = ("year", "month", "week", "day", "hour", "minute", "second", "millisecond")  # SEE iso_datetime
+_simple_interval = re.compile(
+    r"interval\s+(?:'(?P<quoted>-?\d+)(?:\s+(?P<inner>[a-z_]+))?'|(?P<bare>-?\d+(?:\.\d+)?))"
+    r"(?:\s+(?P<unit>[a-z_]+))?(?![\w$@])",
+    re.IGNORECASE,
+)
+_interval_more = ("+", "-", ".", ":", "ago", *"0123456789")  # THE NEXT PART OF A DURATION MAY START WITH THESE
+_interval_gap = r"(?:\s|--[^\n]*|\#[^\n]*|/\*(?:[^*]|\*(?!/))*\*/)"  # COMMENTS ARE WHITESPACE
+_interval_follows = re.compile(
+    rf"{_interval_gap}*(?P<to>(?i:to)(?![\w$@]))?(?P<skip>(?:{_interval_gap}|[,TtPp])*)(?P<next>[\w$@+\-.:(]*)"
+)
+
+
+class SimpleInterval(ParserElement):
+    """
+    THE COMMON FORMS OF interval: INTERVAL n unit, INTERVAL 'n' unit AND INTERVAL 'n unit'.  interval TRIES EVERY
+    WAY TO READ ITS AMOUNT (INCLUDING AS AN expression) AND KEEPS THE LONGEST; THIS IS ONE REGEX, AND FAILS (SO
+    interval IS TRIED) WHEN interval COULD READ MORE, OR READ IT DIFFERENTLY
+    """
+
+    __slots__ = ["durations", "iso_types"]
+
+    def __init__(self, durations):
+        ParserElement.__init__(self)
+        self.durations = durations
+        # THE TYPE OF EACH UNIT WHEN READ AS PART OF A DURATION ("M" IS month THERE)
+        self.iso_types = {}
+        for t in _interval_types:
+            for k, v in durations.items():
+                if v == t:
+                    self.iso_types.setdefault(k.lower(), t)
+
+    def copy(self):
+        output = ParserElement.copy(self)
+        output.durations = self.durations
+        output.iso_types = self.iso_types
+        return output
+
+    def expecting(self):
+        return {"interval": [self]}
+
+    def _min_length(self):
+        return len("interval 0")
+
+    def parse_impl(self, string, start, do_actions=True):
+        if parse_state.exhaustive:
+            # describe_failure() WANTS THE FAILURES interval COLLECTS
+            raise ParseException(self, start, string)
+        found = _simple_interval.match(string, start)
+        call = found and self._to_call(found, string)
+        if not call:
+            raise ParseException(self, start, string)
+        return ParseResults(self, start, found.end(), [call], [])
+
+    def _to_call(self, found, string):
+        quoted, inner, bare, unit = found.group("quoted", "inner", "bare", "unit")
+        amount = quoted or bare
+        if float(amount) == 0:
+            # interval TAKES A ZERO AMOUNT TO BE MISSING
+            return None
+        amount = float(amount) if "." in amount else int(amount)
+        follows = _interval_follows.match(string, found.end())
+        if bare and "," in follows.group("skip"):
+            # A DURATION READS ON, PAST THE COMMA (INTERVAL 1 DAY, b IS ONE COLUMN, NAMED b)
+            return None
+        following = follows.group("next").lower()
+        if any(following.startswith(k) for k in self.durations):
+            # A TYPE, OR THE NEXT PART OF THE DURATION
+            return None
+
+        if quoted and not inner and unit:
+            # INTERVAL 'n' unit: unit IS THE FIRST OF durations IT STARTS WITH
+            if follows.group("to") or following.startswith("("):
+                return None
+            type = self._type(unit.lower())
+        elif (quoted and inner and not unit) or (bare and unit):
+            # INTERVAL 'n unit', INTERVAL n unit: ALSO READ AS A DURATION, SO BOTH READINGS MUST AGREE
+            unit = (inner or unit).lower()
+            type = self.iso_types.get(unit)
+            if type != self._type(unit) or following.startswith(_interval_more):
+                return None
+        else:
+            return None
+        if type is None:
+            return None
+        return Call("interval", [amount, type], {})
+
+    def _type(self, unit):
+        # time_interval_type MATCHES THE FIRST KEY OF durations THAT unit STARTS WITH, AND MUST MATCH ALL OF unit
+        key = next((k for k in self.durations if unit.startswith(k.lower())), None)
+        return self.durations[key] if key and key.lower() == unit else None
+
+
 def to_case_call(tokens):
     cases = list(tokens["case"])
     elze = tokens["else"]
@@ -523,7 +835,7 @@ def to_expression_call(tokens):
     if set(tokens.keys()) & {"over", "within", "filter"}:
         return
 
-    return ParseResults(tokens.type, tokens.start, tokens.end, listwrap(tokens["value"]), tokens.failures,)
+    return ParseResults(tokens.type, tokens.start, tokens.end, listwrap(tokens["value"]), [])
 
 
 def to_over(tokens):
@@ -716,10 +1028,16 @@ def to_table(tokens):
 
 def single_literal(tokens):
     val = tokens[0]
+    if _plain_content.fullmatch(val, 1, len(val) - 1):
+        # NOTHING FOR literal_eval() TO INTERPRET
+        return {"literal": val[1:-1].replace("''", "'")}
     val = '"""' + val[1:-1].replace("''", "\\'").replace('"', '\\"') + '"""'
     return {"literal": ast.literal_eval(val)}
 
 
+_plain_content = re.compile(r"[^\\\r\x00\ud800-\udfff]*")
+
+
 def double_literal(tokens):
     val = tokens[0]
     val = '"""' + val[1:-1].replace('""', '\\"') + '"""'
@@ -793,6 +1111,32 @@ int_num = Regex(r"[+-]?\d+([eE]\+?\d+)?").set_parser_name("int") / parse_int
 int_pos = Regex(r"\d+([eE]\+?\d+)?").set_parser_name("int") / parse_int
 hex_num = Regex(r"0x[0-9a-fA-F]+").set_parser_name("hex") / (lambda t: {"hex": t[0][2:]})
 
+
+def to_literal_list(tokens):
+    # THE ITEMS ARE CONVERTED AS ansi_string, real_num AND int_num WOULD
+    values = []
+    for item in _literal_items.findall(tokens[0]):
+        if item[0] == "'":
+            values.append(single_literal([item]))
+        elif "." in item:
+            values.append(float(item))
+        else:
+            values.append(parse_int([item]))
+    return _tuple_of(values)
+
+
+# A PARENTHESISED LIST OF (TWO OR MORE) LITERAL STRINGS AND UNSIGNED NUMBERS, LIKE A LONG IN LIST, IS MATCHED IN
+# ONE STEP, RATHER THAN PARSING AN expression FOR EACH ITEM.  ANYTHING ELSE (SIGNS, COMMENTS, ...) IS LEFT TO THE
+# GENERAL (expression, ...) RULE, WHICH GIVES THE SAME RESULT FOR THESE LISTS
+_literal_item = r"(\'(\'\'|[^'])*\'|(\d+\.\d*|\.\d+)([eE][+-]?\d+)?|\d+([eE]\+?\d+)?)"
+_literal_items = re.compile(r"'(?:''|[^'])*'|[^\s,()]+")
+literal_list = (
+    Regex(rf"\([ \t\n\r]*{_literal_item}([ \t\n\r]*,[ \t\n\r]*{_literal_item})+[ \t\n\r]*\)").set_parser_name(
+        "literal list"
+    )
+    / to_literal_list
+)
+
 # STRINGS
 ansi_string = Regex(r"\'(\'\'|[^'])*\'") / single_literal
 regex_string = (Regex(r'r\"(\\\"|[^"])*\"') | Regex(r"r\'(\\\'|[^'])*\'")) / literal_regex
@@ -0,0 +1,69 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+import gc
+from multiprocessing import get_all_start_methods
+from unittest import TestCase, skipIf
+
+from mo_sql_parsing import parse, parse_many, parse_mysql, normal_op
+from mo_sql_parsing.bulk import prepare_fork
+
+
+class TestBulk(TestCase):
+    def test_parse_many_in_order(self):
+        sqls = [f"SELECT a{i} FROM t WHERE b = {i}" for i in range(50)]
+        result = list(parse_many(sqls, jobs=2, chunksize=7))
+        self.assertEqual([i for i, _, _ in result], list(range(50)))
+        self.assertEqual([r for _, r, _ in result], [parse(s) for s in sqls])
+        self.assertTrue(all(e is None for _, _, e in result))
+
+    def test_parse_many_unordered(self):
+        sqls = [f"SELECT a{i} FROM t" for i in range(30)]
+        result = sorted(parse_many(sqls, jobs=3, chunksize=4, ordered=False), key=lambda r: r[0])
+        self.assertEqual([r for _, r, _ in result], [parse(s) for s in sqls])
+
+    def test_parse_many_reports_errors(self):
+        sqls = ["SELECT a FROM b", "SELECT FROM WHERE", "SELECT c FROM d"]
+        result = list(parse_many(sqls, jobs=2, chunksize=1))
+        self.assertEqual(result[0], (0, {"select": {"value": "a"}, "from": "b"}, None))
+        self.assertIsNone(result[1][1])
+        self.assertIn("Expecting", result[1][2])
+        self.assertEqual(result[2], (2, {"select": {"value": "c"}, "from": "d"}, None))
+
+    def test_parse_many_single_process_options(self):
+        sqls = ['SELECT "a" FROM b WHERE c IS NULL', "SELECT trim(x) FROM y"]
+        result = [r for _, r, _ in parse_many(sqls, dialect="mysql", jobs=1, null=None, calls=normal_op)]
+        self.assertEqual(result, [parse_mysql(s, null=None, calls=normal_op) for s in sqls])
+
+    def test_parse_many_unknown_dialect(self):
+        # RAISED BY THE CALL, NOT BY THE FIRST next()
+        for jobs in [1, 2]:
+            with self.assertRaises(Exception):
+                parse_many(["SELECT 1"], dialect="cobol", jobs=jobs)
+
+    def test_parse_many_interleaved(self):
+        # EACH SINGLE-PROCESS GENERATOR KEEPS ITS OWN DIALECT AND OPTIONS
+        sqls = ['SELECT "a" FROM b WHERE c IS NULL'] * 3
+        mysql = parse_many(sqls, dialect="mysql", jobs=1, chunksize=1)
+        common = parse_many(sqls, dialect="common", jobs=1, chunksize=1, null=None, calls=normal_op)
+        for (_, m, _), (_, c, _) in zip(mysql, common):
+            self.assertEqual(m, parse_mysql(sqls[0]))
+            self.assertEqual(c, parse(sqls[0], null=None, calls=normal_op))
+
+    @skipIf("fork" not in get_all_start_methods(), "requires fork")
+    def test_parse_many_forked_from_prepared_grammar(self):
+        prepare_fork()
+        try:
+            self.assertGreater(gc.get_freeze_count(), 0)
+            sqls = ["SELECT a FROM b", "SELECT [x] FROM y", "SELECT c FROM d WHERE e = NULL"]
+            result = [r for _, r, _ in parse_many(sqls, dialect="sqlserver", jobs=2, start_method="fork")]
+            self.assertEqual(result[1], {"select": {"value": "x"}, "from": "y"})
+            self.assertEqual(result[2]["where"], {"missing": "e"})
+        finally:
+            gc.unfreeze()
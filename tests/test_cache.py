@@ -0,0 +1,87 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from unittest import TestCase
+
+from mo_times import Timer
+
+from mo_sql_parsing import cache, normal_op, parse, parse_mysql
+
+SQL = "SELECT a, b+1 AS c FROM t WHERE d IN (1, 2) AND e = NULL ORDER BY a"
+
+
+class TestCache(TestCase):
+    def setUp(self):
+        self.cache = cache.enable(size=3)
+
+    def tearDown(self):
+        cache.disable()
+
+    def test_hit(self):
+        first = parse(SQL)
+        second = parse(SQL)
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_result_is_safe_to_mutate(self):
+        first = parse(SQL)
+        first["select"].clear()
+        first["where"]["and"].append("x")
+        cache.disable()
+        expected = parse(SQL)
+        cache.parse_cache = self.cache
+        self.assertEqual(parse(SQL), expected)
+        self.assertIsNot(parse(SQL), parse(SQL))
+
+    def test_keyed_on_options(self):
+        self.assertEqual(parse("SELECT NULL"), {"select": {"value": {"null": {}}}})
+        self.assertEqual(parse("SELECT NULL", null=None), {"select": {"value": None}})
+        self.assertEqual(parse(SQL, calls=normal_op)["where"]["op"], "and")
+        self.assertEqual(parse_mysql(SQL), parse(SQL))
+        self.assertEqual(self.cache.stats()["misses"], 5)
+
+    def test_evict_least_recently_used(self):
+        for i in range(4):
+            parse(f"SELECT a{i}")
+        parse("SELECT a1")
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        parse("SELECT a4")
+        parse("SELECT a1")
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["evictions"], 2)
+        self.assertEqual(stats["entries"], 3)
+
+    def test_byte_budget(self):
+        self.cache = cache.enable(size=100, max_bytes=200)
+        for i in range(10):
+            parse(f"SELECT a{i}, b{i}, c{i} FROM t{i}")
+        stats = self.cache.stats()
+        self.assertLessEqual(stats["bytes"], 200)
+        self.assertGreater(stats["evictions"], 0)
+
+    def test_unmarshallable_null_is_not_cached(self):
+        marker = object()
+        result = parse("SELECT NULL", null=marker)
+        self.assertIs(result["select"]["value"], marker)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_cache_speed(self):
+        self.cache = cache.enable()
+        parse(SQL)
+        with Timer("parse") as parsing:
+            for _ in range(10):
+                cache.disable()
+                parse(SQL)
+        cache.parse_cache = self.cache
+        with Timer("hit") as hits:
+            for _ in range(10):
+                parse(SQL)
+        self.assertLess(hits.duration.seconds * 10, parsing.duration.seconds)
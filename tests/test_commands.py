@@ -11,6 +11,7 @@
 from unittest import TestCase
 
 from mo_testing.fuzzytestcase import add_error_reporting
+from mo_times import Timer
 
 from mo_sql_parsing import parse
 
@@ -705,3 +706,42 @@ class TestCreateForBigQuery(TestCase):
             "name": "a_table",
         }}
         self.assertEqual(result, expected)
+
+    def test_constraint_after_comment(self):
+        result = parse('CREATE TABLE t (a INT, "my key" /* one */ (a), b INT)')
+        expected = {"create table": {
+            "name": "t",
+            "columns": [{"name": "a", "type": {"int": {}}}, {"name": "b", "type": {"int": {}}}],
+            "constraint": {"index": {"name": "my key", "columns": "a"}},
+        }}
+        self.assertEqual(result, expected)
+
+    def test_many_columns(self):
+        # COLUMNS ARE NOT TRIED AS TABLE CONSTRAINTS FIRST
+        columns = ", ".join(f"c{i} VARCHAR(20) NOT NULL DEFAULT 'x'" for i in range(300))
+        with Timer("create wide table") as timer:
+            result = parse(f"CREATE TABLE t ({columns}, PRIMARY KEY (c0))")
+        self.assertEqual(len(result["create table"]["columns"]), 300)
+        self.assertEqual(result["create table"]["constraint"], {"primary_key": {"columns": "c0"}})
+        self.assertLess(timer.duration.seconds, 5)
+
+    def test_many_column_types(self):
+        # A TYPE IS LOOKED UP BY ITS NAME, NOT TRIED AGAINST EVERY TYPE THAT STARTS WITH THE SAME LETTERS
+        types = ["INT", "INT64", "INTEGER", "TIMESTAMP", "TIMESTAMPTZ", "TIMESTAMP WITH TIME ZONE", "DATETIME", "DECIMAL(10, 2)"]
+        columns = ", ".join(f"c{i} {types[i % len(types)]}" for i in range(400))
+        with Timer("create table of many types") as timer:
+            result = parse(f"CREATE TABLE t ({columns})")
+        self.assertEqual(
+            [c["type"] for c in result["create table"]["columns"][:8]],
+            [
+                {"int": {}},
+                {"int64": {}},
+                {"integer": {}},
+                {"timestamp": {}},
+                {"timestamptz": {}},
+                {"timestamp_with_time_zone": {}},
+                {"datetime": {}},
+                {"decimal": [10, 2]},
+            ],
+        )
+        self.assertLess(timer.duration.seconds, 5)
@@ -0,0 +1,213 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from unittest import TestCase
+
+from mo_times import Timer
+
+import mo_sql_parsing
+from mo_sql_parsing import SQL_NULL, deep, normal_op, parse, parse_mysql, parse_sqlserver, simple_op, simple_select
+
+
+def nested(depth, sql="a", tree="a"):
+    """
+    :param sql: the innermost operand, AS SQL
+    :param tree: the innermost operand, AS THE EXPECTED PARSE
+    :return: ((a * 2 + 0) * 2 + 1) * 2 + ... , AS SQL, AND AS THE EXPECTED PARSE
+    """
+    for i in range(depth):
+        sql = f"(({sql}) * 2 + {i})"
+        tree = {"add": [{"mul": [tree, 2]}, i]}
+    return sql, tree
+
+
+def walk_equal(a, b):
+    """
+    SAME AS a == b, BUT WITHOUT RECURSION, FOR DEEP TREES
+    """
+    todo = [(a, b)]
+    while todo:
+        a, b = todo.pop()
+        if isinstance(a, dict):
+            if not isinstance(b, dict) or a.keys() != b.keys():
+                return False
+            todo.extend((a[k], b[k]) for k in a)
+        elif isinstance(a, list):
+            if not isinstance(b, list) or len(a) != len(b):
+                return False
+            todo.extend(zip(a, b))
+        elif a != b:
+            return False
+    return True
+
+
+class TestDeep(TestCase):
+    def tearDown(self):
+        deep.enable()
+        simple_select.enable()
+
+    def test_same_as_grammar(self):
+        # LIFT EVERYTHING, SO THE SHALLOW STATEMENTS CAN BE COMPARED WITH THE GRAMMAR
+        expression, _ = nested(3)
+        statements = [
+            f"SELECT f({expression}), (a + (b + c)) + d FROM t WHERE x IN (SELECT y FROM u WHERE (z = (1 + 2)))",
+            f"SELECT CASE WHEN (a OR (b AND (c OR d))) THEN (e || ('x' || f)) END FROM t ORDER BY ({expression})",
+            "SELECT a FROM t WHERE (b IN (SELECT c FROM d WHERE ((e = 1) OR (f IS NULL)) AND (g(h(i, (j - k)))) > 0))",
+            "INSERT INTO t (a, b) VALUES ((1 + (2 * 3)), 'x')",
+            "WITH w AS (SELECT (a + (b * c)) AS d FROM t) SELECT * FROM w",
+            "SELECT CASE WHEN a THEN CASE WHEN b THEN (CASE WHEN c THEN 1 END) ELSE 0 END ELSE (2) END FROM t",
+            "SELECT * FROM (SELECT a, b FROM (SELECT a, b FROM (SELECT a, b FROM t) x) y)",
+            "SELECT a FROM t JOIN (SELECT a FROM u JOIN (SELECT a FROM v) x ON a = b) y ON (a = b)",
+            "SELECT a FROM t WHERE a IN (SELECT a FROM t WHERE a IN (SELECT a FROM t WHERE a IN (1, 2)))",
+            "SELECT a FROM t WHERE NOT EXISTS (SELECT 1 FROM t WHERE EXISTS (SELECT 1 FROM t WHERE (b = 1)))",
+            "SELECT a FROM t WHERE x IN ((1), (2)) AND (b BETWEEN (1 + 2) AND (3 * (4 + 5)))",
+            "SELECT CAST((a + (b)) AS INT), count(DISTINCT (a)), sum(CASE WHEN (a) THEN 1 END) FROM t",
+            "SELECT row_number() OVER (PARTITION BY (a + b) ORDER BY (c)) FROM t",
+            "SELECT (TRUE OR (NULL)) AND ('x' = (\"a b\")), -(-(a)) FROM t",
+            "INSERT INTO Person(Id, Name) VALUES (1, 'John'), (2, (a || b))",
+            "SELECT * FROM foo SAMPLE(1) WHERE (a < (42))",
+            "SELECT (a) FROM (VALUES ('A', 'B'), ('C', 'D')) AS TABLE(a, b)",
+            "SELECT INTERVAL '1' YEAR(2), (a)",
+        ]
+        for function, sql in [(f, s) for f in (parse, parse_mysql, parse_sqlserver) for s in statements] + [
+            (parse_mysql, "SELECT coalesce(coalesce(\"x\", (1)), 'it''s', (\"y\"))"),
+            (parse_sqlserver, "SELECT (([a b]) * 2 + 0), f([c (d)]) FROM t"),
+        ]:
+            for depth in [1, 2]:
+                deep.enable(depth=depth)
+                for calls in [simple_op, normal_op]:
+                    for null in [SQL_NULL, None]:
+                        expected = function(sql, calls=calls, null=null)
+                        result = deep.parse(*_parser_of(function), sql, null, calls)
+                        if depth == 1:
+                            self.assertIsNotNone(result, sql)
+                        if result is not None:
+                            self.assertEqual(result, expected, sql)
+
+    def test_ddl_is_not_lifted(self):
+        deep.enable(depth=0)
+        parse("SELECT 1")
+        sql = "CREATE TABLE t (a INT, CONSTRAINT c CHECK ((a + 1) > 0))"
+        self.assertIsNone(deep.lift(mo_sql_parsing.common_parser, "common", sql, SQL_NULL, simple_op))
+
+    def test_disabled(self):
+        expression, _ = nested(100)
+        deep.disable()
+        with self.assertRaises(RecursionError):
+            parse(f"SELECT x FROM t WHERE y IN (SELECT z FROM u WHERE {expression} > 1)")
+
+    def test_deep_subquery(self):
+        # 1000 LEVELS IN A STATEMENT THAT simple_select CAN NOT PARSE
+        expression, tree = nested(1000)
+        with Timer("deep statement") as timer:
+            result = parse(f"SELECT x FROM t WHERE y IN (SELECT z FROM u WHERE {expression} > 1)")
+        self.assertEqual(result["where"]["in"][1]["select"], {"value": "z"})
+        self.assertTrue(walk_equal(result["where"]["in"][1]["where"], {"gt": [tree, 1]}))
+        self.assertLess(timer.duration.seconds, 10)
+
+    def test_deep_or(self):
+        # ORM STYLE: a OR (b OR (c OR ...)), WHICH THE GRAMMAR FLATTENS
+        depth = 1000
+        sql = "SELECT CASE WHEN " + "".join(f"a{i} = {i} OR (" for i in range(depth)) + "b" + ")" * depth + " THEN 1 END"
+        with Timer("deep or") as timer:
+            result = parse(sql)
+        terms = result["select"]["value"]["case"]["when"]["or"]
+        self.assertEqual(len(terms), depth + 1)
+        self.assertEqual(terms[-2:], [{"eq": ["a999", 999]}, "b"])
+        self.assertLess(timer.duration.seconds, 10)
+
+    def test_deep_simple_select(self):
+        expression, tree = nested(1000)
+        with Timer("deep simple select") as timer:
+            result = parse(f"SELECT {expression} AS x FROM t")
+        self.assertTrue(walk_equal(result, {"select": {"value": tree, "name": "x"}, "from": "t"}))
+        self.assertLess(timer.duration.seconds, 2)
+
+    def test_long_chain(self):
+        terms = 10000
+        sql = "SELECT a FROM t WHERE " + " OR ".join(f"(a{i} = {i} AND b{i} LIKE 'x%')" for i in range(terms))
+        with Timer("long chain") as timer:
+            result = parse(sql)
+        self.assertEqual(len(result["where"]["or"]), terms)
+        self.assertEqual(result["where"]["or"][-1], {"and": [{"eq": ["a9999", 9999]}, {"like": ["b9999", {"literal": "x%"}]}]})
+        self.assertLess(timer.duration.seconds, 10)
+
+    def test_deep_case(self):
+        depth = 200
+        case, tree = "1", 1
+        for _ in range(depth):
+            case, tree = f"CASE WHEN a THEN {case} ELSE 0 END", {"case": [{"when": "a", "then": tree}, 0]}
+        with Timer("deep case") as timer:
+            result = parse(f"SELECT {case} FROM t")
+        self.assertTrue(walk_equal(result, {"select": {"value": tree}, "from": "t"}))
+
+        case, tree = "1", 1
+        for _ in range(depth):
+            case, tree = f"(CASE WHEN a THEN {case} END)", {"case": {"when": "a", "then": tree}}
+        result = parse(f"SELECT {case} FROM t")
+        self.assertTrue(walk_equal(result, {"select": {"value": tree}, "from": "t"}))
+        self.assertLess(timer.duration.seconds, 10)
+
+    def test_deep_nested_subqueries(self):
+        depth = 200
+        query, tree = "t", "t"
+        for _ in range(depth):
+            query, tree = f"(SELECT a, b FROM {query})", {"select": [{"value": "a"}, {"value": "b"}], "from": tree}
+        with Timer("deep from") as timer:
+            result = parse(f"SELECT * FROM {query}")
+        self.assertTrue(walk_equal(result, {"select": "*", "from": tree}))
+        self.assertLess(timer.duration.seconds, 10)
+
+        query, tree = "(1, 2)", [1, 2]
+        for _ in range(depth):
+            query, tree = f"(SELECT a FROM t WHERE a IN {query})", {"select": {"value": "a"}, "from": "t", "where": {"in": ["a", tree]}}
+        with Timer("deep in") as timer:
+            result = parse(f"SELECT a FROM t WHERE a IN {query}")
+        self.assertTrue(walk_equal(result, {"select": {"value": "a"}, "from": "t", "where": {"in": ["a", tree]}}))
+        self.assertLess(timer.duration.seconds, 10)
+
+        query, tree = "b = 1", {"eq": ["b", 1]}
+        for _ in range(depth):
+            query, tree = f"EXISTS (SELECT 1 FROM t WHERE {query})", {"exists": {"select": {"value": 1}, "from": "t", "where": tree}}
+        with Timer("deep exists") as timer:
+            result = parse(f"SELECT a FROM t WHERE {query}")
+        self.assertTrue(walk_equal(result, {"select": {"value": "a"}, "from": "t", "where": tree}))
+        self.assertLess(timer.duration.seconds, 10)
+
+    def test_deep_quotes(self):
+        # THE LAYERS ARE CUT WITH THE QUOTING RULES OF THE DIALECT
+        depth = 200
+        expression, tree = nested(depth, '"a b"', "a b")
+        self.assertTrue(walk_equal(parse(f"SELECT {expression} FROM t"), {"select": {"value": tree}, "from": "t"}))
+        expression, tree = nested(depth, "[a b]", "a b")
+        self.assertTrue(walk_equal(parse_sqlserver(f"SELECT {expression} FROM t"), {"select": {"value": tree}, "from": "t"}))
+
+        call, tree = '"x"', {"literal": "x"}
+        for _ in range(depth):
+            call, tree = f"coalesce({call}, 1)", {"coalesce": [tree, 1]}
+        self.assertTrue(walk_equal(parse_mysql(f"SELECT {call}"), {"select": {"value": tree}}))
+
+    def test_deep_true(self):
+        expression, tree = nested(200, "TRUE", True)
+        with Timer("deep true") as timer:
+            result = parse(f"SELECT x FROM t WHERE {expression} > 1")
+        self.assertTrue(walk_equal(result, {"select": {"value": "x"}, "from": "t", "where": {"gt": [tree, 1]}}))
+        self.assertLess(timer.duration.seconds, 2)
+
+
+def _parser_of(function):
+    """
+    :return: (parser, dialect) USED BY THE GIVEN parse FUNCTION
+    """
+    function("SELECT 1")
+    if function is parse_mysql:
+        return mo_sql_parsing.mysql_parser, "mysql"
+    if function is parse_sqlserver:
+        return mo_sql_parsing.sqlserver_parser, "sqlserver"
+    return mo_sql_parsing.common_parser, "common"
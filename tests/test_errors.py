@@ -6,12 +6,16 @@
 #
 # Author: Kyle Lahnakoski (kyle@lahnakoski.com)
 #
+from threading import Thread
 from unittest import skip
 
+from mo_parsing import ParseException
 from mo_parsing.debug import Debugger
 from mo_testing.fuzzytestcase import FuzzyTestCase
 
-from mo_sql_parsing import parse, format, parse_mysql
+import mo_sql_parsing
+from mo_sql_parsing import memo, parse, format, parse_mysql, utils
+from mo_sql_parsing.utils import describe_failure
 
 
 class TestErrors(FuzzyTestCase):
@@ -103,3 +107,40 @@ class TestErrors(FuzzyTestCase):
         )"""
         with self.assertRaises('found "...\\n'):
             result = parse(sql)
+
+    def test_dispatch_names_what_grammar_expects(self):
+        with self.assertRaises("Expecting identifier_with_dashes, found end of text"):
+            parse_mysql("SELECT a FROM t WHERE a = ")
+        with self.assertRaises("Expecting simple_ident, found end of text"):
+            parse("SELECT a +")
+        with self.assertRaises("Expecting {pos} | {neg} | {binary_not} | {not} | {simple_ident} | {ansi_string}"):
+            parse("SELECT a FROM t WHERE a = 'x")
+
+    def test_describe_failure_is_per_thread(self):
+        seen = []
+        memo.state.exhaustive = True
+        try:
+            thread = Thread(target=lambda: seen.append(memo.state.exhaustive))
+            thread.start()
+            thread.join()
+        finally:
+            memo.state.exhaustive = False
+        self.assertEqual(seen, [False])
+
+        with self.assertRaises("Expecting {pos} | {neg} | {binary_not} | {not} | {simple_ident} | {ansi_string}"):
+            parse("SELECT a FROM t WHERE a = 'x")
+        self.assertFalse(memo.state.exhaustive)
+
+    def test_describe_failure_limit(self):
+        # LONG STATEMENTS RAISE THE FIRST ERROR, RATHER THAN PARSE AGAIN
+        parse("SELECT 1")
+        sql = "SELECT a FROM t WHERE a = 'x"
+        self.assertIsNotNone(describe_failure(mo_sql_parsing.common_parser, sql))
+        limit = utils.describe_limit
+        utils.describe_limit = len(sql) - 1
+        try:
+            self.assertIsNone(describe_failure(mo_sql_parsing.common_parser, sql))
+            with self.assertRaises(ParseException):
+                parse(sql)
+        finally:
+            utils.describe_limit = limit
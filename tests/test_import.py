@@ -0,0 +1,92 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+from mo_sql_parsing.operators import reserved_words
+
+GRAMMAR_MODULES = [
+    "mo_parsing",
+    "mo_sql_parsing.keywords",
+    "mo_sql_parsing.sql_parser",
+    "mo_sql_parsing.types",
+    "mo_sql_parsing.utils",
+    "mo_sql_parsing.windows",
+]
+
+LOADED = """
+import json, sys, time
+start = time.time()
+import mo_sql_parsing
+imported = time.time() - start
+{action}
+print(json.dumps({{"seconds": imported, "modules": sorted(sys.modules)}}))
+"""
+
+
+class TestImport(TestCase):
+    def test_import_does_not_build_grammar(self):
+        result = _run("")
+        self.assertFalse(set(GRAMMAR_MODULES) & set(result["modules"]))
+        print(f"import mo_sql_parsing: {round(result['seconds'] * 1000)} milliseconds")
+
+    def test_format_does_not_build_grammar(self):
+        result = _run('mo_sql_parsing.format({"select": {"value": "a", "name": "from"}, "from": "t"})')
+        self.assertFalse(set(GRAMMAR_MODULES) & set(result["modules"]))
+
+    def test_parse_builds_grammar(self):
+        result = _run('mo_sql_parsing.parse("SELECT a FROM b")')
+        self.assertTrue(set(GRAMMAR_MODULES) <= set(result["modules"]))
+
+    def test_lazy_exports(self):
+        import mo_sql_parsing
+        from mo_parsing import debug
+        from mo_sql_parsing.utils import ansi_string
+
+        self.assertIs(mo_sql_parsing.ansi_string, ansi_string)
+        self.assertIs(mo_sql_parsing.debug, debug)
+        with self.assertRaises(AttributeError):
+            mo_sql_parsing.no_such_name
+
+    def test_reserved_words_match_grammar(self):
+        from mo_parsing import NotAny
+        from mo_sql_parsing.keywords import RESERVED
+        from mo_sql_parsing.utils import NotReserved
+
+        for word in reserved_words:
+            RESERVED.parse_string(word)
+            RESERVED.parse_string(word.upper())
+        for word in ["a", "select_a", "fromage", "count"]:
+            with self.assertRaises(Exception):
+                RESERVED.parse_string(word, parse_all=True)
+            self.assertNotIn(word, reserved_words)
+
+        lookahead, expected = NotReserved(RESERVED), NotAny(RESERVED)
+        for text in ["from", "FROM x", "From.a", "from$", "from_a", "froms", "in", "int", "Inner", "ï", "1 in", "", "a"]:
+            self.assertEqual(_matches(lookahead, text), _matches(expected, text), text)
+
+
+def _run(action):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    output = subprocess.run(
+        [sys.executable, "-c", LOADED.format(action=action)], env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout)
+
+
+def _matches(element, text):
+    try:
+        element.parse_impl(text, 0)
+        return True
+    except Exception:
+        return False
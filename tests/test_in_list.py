@@ -0,0 +1,61 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from unittest import TestCase
+
+from mo_times import Timer
+
+from mo_sql_parsing import parse, parse_mysql, simple_select
+
+
+class TestInList(TestCase):
+    def setUp(self):
+        # THESE TEST THE GRAMMAR
+        simple_select.disable()
+
+    def tearDown(self):
+        simple_select.enable()
+
+    def test_numbers(self):
+        self.assertEqual(
+            parse("SELECT a FROM t WHERE b IN (1, 2.5,\n3e2, .5 )"),
+            {"select": {"value": "a"}, "from": "t", "where": {"in": ["b", [1, 2.5, 300, 0.5]]}},
+        )
+
+    def test_strings(self):
+        self.assertEqual(
+            parse("SELECT a FROM t WHERE b NOT IN ('x', 'it''s', 'a\\nb')"),
+            {"select": {"value": "a"}, "from": "t", "where": {"nin": ["b", {"literal": ["x", "it's", "a\nb"]}]}},
+        )
+
+    def test_mixed(self):
+        self.assertEqual(parse("SELECT a IN (1, 'x')"), {"select": {"value": {"in": ["a", {"literal": [1, "x"]}]}}})
+        # A FALSY LITERAL KEEPS THE ITEMS SEPARATE
+        self.assertEqual(parse("SELECT a IN ('x', 0)"), {"select": {"value": {"in": ["a", [{"literal": "x"}, 0]]}}})
+
+    def test_not_all_literals(self):
+        self.assertEqual(parse("SELECT a IN (1, b)"), {"select": {"value": {"in": ["a", [1, "b"]]}}})
+        self.assertEqual(parse("SELECT a IN (2x, 1)"), {"select": {"value": {"in": ["a", [{"mul": [2, "x"]}, 1]]}}})
+        self.assertEqual(parse("SELECT a IN (1 /* one */, 2)"), {"select": {"value": {"in": ["a", [1, 2]]}}})
+        self.assertEqual(parse_mysql('SELECT a IN ("x", "y")'), {"select": {"value": {"in": ["a", {"literal": ["x", "y"]}]}}})
+
+    def test_huge_lists(self):
+        terms = 50000
+        # THE SUB-QUERY KEEPS THESE FROM simple_select, IN CASE IT IS ENABLED
+        numbers = ", ".join(str(i) for i in range(terms))
+        with Timer("numbers") as timer:
+            result = parse(f"SELECT a FROM t WHERE b IN ({numbers}) AND c IN (SELECT d FROM u)")
+        self.assertEqual(result["where"]["and"][0], {"in": ["b", list(range(terms))]})
+        self.assertLess(timer.duration.seconds, 5)
+
+        strings = ", ".join(f"'s{i}'" for i in range(terms))
+        with Timer("strings") as timer:
+            result = parse(f"SELECT a FROM t WHERE b IN ({strings}) AND c IN (SELECT d FROM u)")
+        self.assertEqual(result["where"]["and"][0], {"in": ["b", {"literal": [f"s{i}" for i in range(terms)]}]})
+        self.assertLess(timer.duration.seconds, 5)
@@ -0,0 +1,171 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from unittest import TestCase
+
+from mo_parsing import Keyword, Literal, Word
+from mo_parsing.exceptions import ParseException
+from mo_parsing.results import NO_PARSER, ParseResults
+from mo_times import Timer
+
+import mo_sql_parsing
+from mo_sql_parsing import SQL_NULL, _parse_string, infix, simple_op, simple_select, sql_parser
+from mo_sql_parsing.utils import Dispatch, WordDispatch, keyword, to_json_operator
+
+grammar = None
+
+
+def parse(sql):
+    # infix IS OPT-IN, SO BUILD A GRAMMAR WITH IT (mo_sql_parsing.parse() KEEPS THE mo_parsing infix_notation)
+    global grammar
+    if grammar is None:
+        infix.enable()
+        try:
+            grammar = sql_parser.common_parser()
+        finally:
+            infix.disable()
+    return _parse_string(grammar, "common", sql, SQL_NULL, simple_op)
+
+
+class TestInfix(TestCase):
+    def setUp(self):
+        # THESE TEST THE GRAMMAR
+        simple_select.disable()
+
+    def tearDown(self):
+        simple_select.enable()
+
+    def test_opt_in(self):
+        self.assertFalse(infix.enabled)
+        sql = "SELECT 1 - 2 - 3, 2 * 3 + 4 * 5, NOT a = b, a BETWEEN 1 AND 2 AND c"
+        self.assertEqual(mo_sql_parsing.parse(sql), parse(sql))
+
+    def test_precedence(self):
+        self.assertEqual(
+            parse("SELECT 1 - 2 - 3, 2 * 3 + 4 * 5"),
+            {"select": [{"value": {"sub": [{"sub": [1, 2]}, 3]}}, {"value": {"add": [{"mul": [2, 3]}, {"mul": [4, 5]}]}}]},
+        )
+        self.assertEqual(parse("SELECT NOT a = b"), {"select": {"value": {"not": {"eq": ["a", "b"]}}}})
+        self.assertEqual(parse("SELECT -a[1]"), {"select": {"value": {"neg": {"get": ["a", 1]}}}})
+        self.assertEqual(
+            parse("SELECT a BETWEEN 1 AND 2 AND c"), {"select": {"value": {"and": [{"between": ["a", 1, 2]}, "c"]}}}
+        )
+
+    def test_prefix_after_binary(self):
+        self.assertEqual(parse("SELECT a || - b"), {"select": {"value": {"concat": ["a", {"neg": "b"}]}}})
+        self.assertEqual(parse("SELECT a = NOT b"), {"select": {"value": {"eq": ["a", {"not": "b"}]}}})
+        self.assertEqual(parse("SELECT - NOT a"), {"select": {"value": {"neg": {"not": "a"}}}})
+
+    def test_incomplete_between(self):
+        with self.assertRaises(ParseException):
+            parse("SELECT a BETWEEN b OR c AND d")
+
+    def test_operands(self):
+        self.assertEqual(
+            parse('SELECT nullable, null, cases, true_x, count(1), a.*, "b"(c), (d)'),
+            {"select": [
+                {"value": "nullable"},
+                {"value": {"null": {}}},
+                {"value": "cases"},
+                {"value": "true_x"},
+                {"value": {"count": 1}},
+                {"value": "a.*"},
+                {"value": {"b": "c"}},
+                {"value": "d"},
+            ]},
+        )
+
+    def test_dispatch(self):
+        # ONLY THE ALTERNATIVES THAT CAN START WITH THE TEXT ARE TRIED, BUT IN THE ORDER GIVEN
+        operand = Dispatch([Keyword("null", caseless=True), Literal("("), Word("abcdelnuNUL")])
+        self.assertEqual(operand.parse_string("NULL")[0], "null")
+        self.assertEqual(operand.parse_string("nullable")[0], "nullable")
+        self.assertEqual(operand.parse_string("(")[0], "(")
+        with self.assertRaises(ParseException):
+            operand.parse_string("1")
+
+    def test_word_dispatch(self):
+        # ONLY THE ALTERNATIVES THAT START WITH THE WORD ARE TRIED, IN THE ORDER GIVEN
+        type_name = WordDispatch([
+            keyword("double precision"),
+            keyword("double"),
+            Keyword("int", caseless=True),
+            Keyword("int64", caseless=True),
+        ])
+        self.assertEqual(type_name.parse_string("DOUBLE  Precision")[0], "double_precision")
+        self.assertEqual(type_name.parse_string("double")[0], "double")
+        self.assertEqual(type_name.parse_string("INT")[0], "int")
+        self.assertEqual(type_name.parse_string("int64")[0], "int64")
+        self.assertEqual(set(type_name.expecting()), {"double", "int", "int64"})
+        with self.assertRaises(ParseException):
+            type_name.parse_string("integer")
+
+    def test_many_identifiers(self):
+        sql = "SELECT " + ", ".join(f"t.c{i} + p{i} * q{i}" for i in range(1000)) + " FROM t"
+        with Timer("identifiers") as timer:
+            result = parse(sql)
+        self.assertEqual(result["select"][-1], {"value": {"add": ["t.c999", {"mul": ["p999", "q999"]}]}})
+        self.assertLess(timer.duration.seconds, 30)
+
+    def test_parentheses(self):
+        self.assertEqual(
+            parse("SELECT ((SELECT 1)) + 1, (/* c */ select a from b), (a, b), (selected)"),
+            {"select": [
+                {"value": {"add": [{"select": {"value": 1}}, 1]}},
+                {"value": {"select": {"value": "a"}, "from": "b"}},
+                {"value": ["a", "b"]},
+                {"value": "selected"},
+            ]},
+        )
+
+    def test_deep_parentheses(self):
+        # AN (expression) IS NOT TRIED AS A SUB-QUERY, SO EACH LEVEL IS PARSED ONCE
+        depth = 30
+        sql = "SELECT " + "(" * depth + "a" + "".join(f" + b{i}) * c{i}" for i in range(depth))
+        with Timer("deep parentheses") as timer:
+            result = parse(sql)
+        expected = "a"
+        for i in range(depth):
+            expected = {"mul": [{"add": [expected, f"b{i}"]}, f"c{i}"]}
+        self.assertEqual(result, {"select": {"value": expected}})
+        self.assertLess(timer.duration.seconds, 1)
+
+    def test_long_chain(self):
+        sql = "SELECT " + " + ".join(f"a{i} * 2" for i in range(2000))
+        with Timer("long chain") as timer:
+            result = parse(sql)
+        self.assertEqual(result, {"select": {"value": {"add": [{"mul": [f"a{i}", 2]} for i in range(2000)]}}})
+        self.assertLess(timer.duration.seconds, 30)
+
+    def test_nested_associative(self):
+        self.assertEqual(parse("SELECT (a AND b) AND (c AND d)"), {"select": {"value": {"and": ["a", "b", "c", "d"]}}})
+        self.assertEqual(parse("SELECT a + (b + c) + d * (e * f)"), {"select": {"value": {"add": ["a", "b", "c", {"mul": ["d", "e", "f"]}]}}})
+        self.assertEqual(parse("SELECT a || ('b' || c)"), {"select": {"value": {"concat": ["a", {"literal": "b"}, "c"]}}})
+        self.assertEqual(parse("SELECT a - (b - c) - d"), {"select": {"value": {"sub": [{"sub": ["a", {"sub": ["b", "c"]}]}, "d"]}}})
+
+    def test_chain_does_not_change_operands(self):
+        # THE GRAMMAR COSTS ABOUT 1ms PER TERM, SO BUILD THE CHAIN LIKE THE GRAMMAR DOES, WITHOUT IT
+        for terms in [1000, 10000]:
+            with Timer(f"chain of {terms}") as timer:
+                left = "a0"
+                for i in range(1, terms):
+                    left = to_json_operator(ParseResults(NO_PARSER, 0, 0, [left, "and", f"a{i}"], []))
+            self.assertEqual(left.args, [f"a{i}" for i in range(terms)])
+            self.assertLess(timer.duration.seconds, terms / 2000)
+
+        # A MEMOIZED OPERAND IS NOT CHANGED BY THE CHAINS IT STARTS
+        shared = to_json_operator(ParseResults(NO_PARSER, 0, 0, ["a", "and", "b"], []))
+        first = to_json_operator(ParseResults(NO_PARSER, 0, 0, [shared, "and", "c"], []))
+        second = to_json_operator(ParseResults(NO_PARSER, 0, 0, [shared, "and", "d"], []))
+        self.assertEqual(shared.args, ["a", "b"])
+        self.assertEqual(first.args, ["a", "b", "c"])
+        self.assertEqual(second.args, ["a", "b", "d"])
+        self.assertEqual(parse("SELECT (a AND b) AND c, (a AND b) AND d"), {
+            "select": [{"value": {"and": ["a", "b", "c"]}}, {"value": {"and": ["a", "b", "d"]}}]
+        })
@@ -0,0 +1,94 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from array import array
+from unittest import TestCase, skipIf
+
+from mo_times import Timer
+
+from mo_sql_parsing import insert_columns, iter_insert_rows
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestInserts(TestCase):
+    def test_rows(self):
+        rows = iter_insert_rows("INSERT INTO t (a, \"b c\", d) VALUES (1, 'x''y', NULL), (-2.5, '', TRUE);")
+        self.assertEqual(list(rows), ["t", ["a", "b c", "d"], (1, "x'y", None), (-2.5, "", True)])
+
+    def test_no_columns(self):
+        rows = iter_insert_rows("INSERT INTO [s].[t] VALUES (1e3),(.5)", dialect="sqlserver", null="N")
+        self.assertEqual(list(rows), ["s.t", None, (1000,), (0.5,)])
+
+    def test_mysqldump(self):
+        sql = "INSERT INTO `db`.`t` VALUES (1,'it\\'s','a\\\\b\\nc',\"d\",'%\\%'),(2,NULL,0x1F)"
+        self.assertEqual(
+            list(iter_insert_rows(sql, dialect="mysql")), ["db.t", None, (1, "it's", "a\\b\nc", "d", "%\\%"), (2, None, {"hex": "1F"})],
+        )
+
+    def test_other_rows(self):
+        # ROWS THAT ARE NOT ALL LITERALS ARE PARSED BY THE GRAMMAR
+        rows = iter_insert_rows("INSERT INTO t VALUES (1, 'x', 2.5), (2, 'y', f(3)), (3, 'z', 1 + 2)")
+        self.assertEqual(list(rows), ["t", None, (1, "x", 2.5), (2, "y", {"f": 3}), (3, "z", {"add": [1, 2]})])
+
+    def test_names_are_not_strings(self):
+        # A ROW WITH A NAME IS PARSED BY THE GRAMMAR; THE NAME IS NOT THE SAME AS THE STRING
+        rows = list(iter_insert_rows("INSERT INTO t VALUES ('abc'), (abc), ('abc', DEFAULT)"))
+        self.assertEqual(rows[2:], [("abc",), ({"identifier": "abc"},), ("abc", {"identifier": "DEFAULT"})])
+        rows = list(iter_insert_rows("INSERT INTO t VALUES (NULL, f(NULL), x)", null="N"))
+        self.assertEqual(rows[2:], [("N", {"f": "N"}, {"identifier": "x"})])
+
+    def test_comments_between_rows(self):
+        sql = "INSERT INTO t VALUES ('a' /* c */, 1) /* x */ , (2, f(1)) -- y\n , (3, 'x') # z\n, (4, 'w') -- end"
+        rows = list(iter_insert_rows(sql, dialect="mysql"))
+        self.assertEqual(rows[2:], [("a", 1), (2, {"f": 1}), (3, "x"), (4, "w")])
+
+    def test_not_insert(self):
+        with self.assertRaises(Exception):
+            list(iter_insert_rows("INSERT INTO t SELECT a FROM b"))
+        with self.assertRaises(Exception):
+            list(iter_insert_rows("INSERT INTO t VALUES (1) garbage"))
+
+    def test_many_rows(self):
+        count = 200000
+        sql = "INSERT INTO `t` VALUES " + ",".join(f"({i},'name {i}',{i}.5,NULL)" for i in range(count))
+        with Timer("stream rows") as timer:
+            total = 0
+            for row in iter_insert_rows(sql, dialect="mysql"):
+                total += 1
+        self.assertEqual(total, count + 2)
+        self.assertEqual(row, (count - 1, f"name {count - 1}", count - 0.5, None))
+        self.assertLess(timer.duration.seconds, 20)
+
+    def test_columns(self):
+        sql = "INSERT INTO t (a, b, c, d, e) VALUES (1, 1.5, 'x', 1, TRUE), (2, 2.5, NULL, 99999999999999999999, FALSE)"
+        table, columns, values = insert_columns(sql)
+        self.assertEqual(table, "t")
+        self.assertEqual(columns, ["a", "b", "c", "d", "e"])
+        self.assertEqual(
+            values, [array("q", [1, 2]), array("d", [1.5, 2.5]), ["x", None], [1, 99999999999999999999], [True, False]],
+        )
+
+    def test_mixed_columns(self):
+        # A COLUMN IS TYPED ONLY IF ALL ITS VALUES ARE int, OR ALL ARE float
+        _, columns, values = insert_columns("INSERT INTO t VALUES (1, 1.5, 1), (2.5, 2, NULL)")
+        self.assertIsNone(columns)
+        self.assertEqual(values, [[1, 2.5], [1.5, 2], [1, None]])
+        with self.assertRaises(Exception):
+            insert_columns("INSERT INTO t VALUES (1, 2), (3)")
+
+    @skipIf(not numpy, "requires numpy")
+    def test_numpy_columns(self):
+        _, _, values = insert_columns("INSERT INTO t VALUES (1, 1.5, 'x'), (2, 2.5, 'y')", numpy=True)
+        self.assertEqual(values[0].dtype, numpy.int64)
+        self.assertEqual(values[1].tolist(), [1.5, 2.5])
+        self.assertEqual(values[2], ["x", "y"])
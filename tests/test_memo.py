@@ -0,0 +1,80 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from unittest import TestCase
+
+from mo_times import Timer
+
+from mo_sql_parsing import memo, parse, parse_mysql, simple_select
+
+STATEMENTS = [
+    "SELECT a.b AS c, d.e f FROM s.t AS x JOIN u.v y ON x.a = y.b WHERE x.c IN (1, 2) ORDER BY a.b",
+    "SELECT CAST(a.b AS INTEGER), CASE WHEN a.c > 1 THEN a.d ELSE a.e END FROM a",
+    "WITH t AS (SELECT a.b FROM c.d) SELECT t.b FROM t WHERE t.b > DATE '2020-01-01'",
+    "SELECT a FROM t WHERE b = (SELECT max(c.d) FROM c GROUP BY c.e)",
+    "INSERT INTO s.t (a, b) VALUES (1, 'x'), (2, 'y')",
+]
+
+
+class TestMemo(TestCase):
+    def setUp(self):
+        simple_select.disable()  # THE MEMO IS FOR THE GRAMMAR
+        memo.reset()
+
+    def tearDown(self):
+        memo.enable()
+        simple_select.enable()
+
+    def test_same_result(self):
+        for sql in STATEMENTS:
+            for parser in [parse, parse_mysql]:
+                memo.enable()
+                result = parser(sql)
+                memo.disable()
+                expected = parser(sql)
+                self.assertEqual(result, expected, sql)
+
+    def test_stats(self):
+        parse(STATEMENTS[0])
+        stats = memo.stats()
+        self.assertGreater(stats["hits"], 0)
+        self.assertGreater(stats["misses"], 0)
+        self.assertEqual(stats["evictions"], 0)
+
+        memo.reset()
+        memo.disable()
+        parse(STATEMENTS[0])
+        self.assertEqual(memo.stats(), {"hits": 0, "misses": 0, "evictions": 0})
+
+    def test_entry_cap(self):
+        memo.enable(size=3)
+        expected = [parse(sql) for sql in STATEMENTS]
+        self.assertGreater(memo.stats()["evictions"], 0)
+        memo.enable(size=0)
+        self.assertEqual([parse(sql) for sql in STATEMENTS], expected)
+
+    def test_byte_cap(self):
+        memo.enable(max_bytes=memo.ENTRY_BYTES * 2)
+        parse(STATEMENTS[0])
+        self.assertGreater(memo.stats()["evictions"], 0)
+
+    def test_table_is_per_parse(self):
+        parse(STATEMENTS[1])
+        self.assertIsNone(getattr(memo.state, "table", None))
+
+    def test_nested_calls(self):
+        # EACH LEVEL USED TO DOUBLE THE FAILURES CARRIED BY THE RESULT
+        sql = "SELECT " + "f(" * 30 + "a" + ")" * 30 + " FROM t"
+        with Timer("nested calls") as timer:
+            result = parse(sql)
+        expected = "a"
+        for _ in range(30):
+            expected = {"f": expected}
+        self.assertEqual(result, {"select": {"value": expected}, "from": "t"})
+        self.assertLess(timer.duration.seconds, 2)
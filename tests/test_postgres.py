@@ -10,6 +10,7 @@
 from unittest import TestCase
 
 from mo_parsing.debug import Debugger
+from mo_times import Timer
 
 from mo_sql_parsing import parse
 
@@ -371,6 +372,60 @@ class TestPostgres(TestCase):
         ]}}}
         self.assertEqual(result, expect)
 
+    def test_interval_forms(self):
+        sql = """SELECT
+            INTERVAL '1' DAY, INTERVAL 3 HOURS AS h, INTERVAL '-1 week', INTERVAL 2.5 SECOND AS s, INTERVAL '5 days ago',
+            INTERVAL '1' YEAR(2), INTERVAL '1-2' YEAR TO MONTH, INTERVAL '2 hours 30 minutes', INTERVAL 7 DAY * 2
+        """
+        result = parse(sql)
+        expect = {"select": [
+            {"value": {"interval": [1, "day"]}},
+            {"value": {"interval": [3, "hour"]}, "name": "h"},
+            {"value": {"interval": [-1, "week"]}},
+            {"value": {"interval": [2.5, "second"]}, "name": "s"},
+            {"value": {"interval": [-5, "day"]}},
+            {"value": {"interval": [1, {"year": 2}]}},
+            {"value": {"cast": [
+                {"add": [{"interval": [1, "year"]}, {"interval": [2, "month"]}]},
+                {"year": {}, "month": {}},
+            ]}},
+            {"value": {"add": [{"interval": [2, "hour"]}, {"interval": [30, "minute"]}]}},
+            {"value": {"mul": [{"interval": [7, "day"]}, 2]}},
+        ]}
+        self.assertEqual(result, expect)
+
+    def test_many_intervals(self):
+        sql = "SELECT " + ", ".join(
+            f"INTERVAL '{i + 1}' DAY, INTERVAL '{i + 1} minutes', now() - INTERVAL {i + 1} HOUR AS h{i}" for i in range(100)
+        )
+        with Timer("parse 300 intervals") as timer:
+            result = parse(sql)
+        self.assertEqual(len(result["select"]), 300)
+        self.assertEqual(
+            result["select"][-1], {"value": {"sub": [{"now": {}}, {"interval": [100, "hour"]}]}, "name": "h99"},
+        )
+        self.assertLess(timer.duration.seconds, 2)
+
+    def test_interval_then_comma(self):
+        # A DURATION READS ON, PAST THE COMMA, SO THE NEXT WORD IS THE NAME; A QUOTED AMOUNT ENDS AT ITS QUOTE
+        expect = {"select": {"value": {"interval": [1, "day"]}, "name": "b"}}
+        self.assertEqual(parse("SELECT INTERVAL 1 DAY, b"), expect)
+        self.assertEqual(parse("SELECT INTERVAL 1 DAY\n, b"), expect)
+        self.assertEqual(
+            parse("SELECT a + INTERVAL 1 month /* c */ , b"),
+            {"select": {"value": {"add": ["a", {"interval": [1, "month"]}]}, "name": "b"}},
+        )
+        self.assertEqual(
+            parse("SELECT INTERVAL '1' DAY, b"), {"select": [{"value": {"interval": [1, "day"]}}, {"value": "b"}]}
+        )
+
+    def test_interval_error(self):
+        with self.assertRaises(Exception) as context:
+            parse("SELECT INTERVAL 1 DAY )")
+        message = str(context.exception)
+        self.assertIn("{time_interval_type}", message)
+        self.assertIn("{ago}", message)
+
     def test_issue_149_insert(self):
         sql = """WITH delta AS (
             SELECT * from ta
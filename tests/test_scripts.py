@@ -0,0 +1,127 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+import mmap
+import tempfile
+from io import BytesIO, StringIO
+from unittest import TestCase
+
+from mo_sql_parsing import parse, parse_mysql, parse_script, parse_sqlserver, scripts
+from mo_sql_parsing.scripts import split_script
+
+SCRIPT = """
+-- a comment; with a ' quote
+SELECT 'a;b' AS "c;d", `e;f` FROM t; # another; "comment"
+/* block; comment */ INSERT INTO t VALUES ('it''s;', 2);;
+/* only a comment; */
+SELECT a -- trailing; comment
+FROM b
+"""
+
+STATEMENTS = [
+    "SELECT 'a;b' AS \"c;d\", `e;f` FROM t",
+    "INSERT INTO t VALUES ('it''s;', 2)",
+    "SELECT a -- trailing; comment\nFROM b\n",
+]
+
+
+class TestScripts(TestCase):
+    def tearDown(self):
+        scripts.CHUNK_SIZE = 64 * 1024
+        scripts.RELEASE_SIZE = 16 * 1024 * 1024
+
+    def test_split(self):
+        result = list(split_script(SCRIPT))
+        self.assertEqual([sql for _, sql in result], STATEMENTS)
+        for offset, sql in result:
+            self.assertTrue(SCRIPT[offset:].startswith(sql))
+
+    def test_split_file_at_every_chunk_size(self):
+        expected = list(split_script(SCRIPT))
+        for size in range(1, len(SCRIPT) + 1):
+            scripts.CHUNK_SIZE = size
+            self.assertEqual(list(split_script(StringIO(SCRIPT))), expected, f"chunk size {size}")
+
+    def test_split_sqlserver(self):
+        sql = "SELECT [a;b] FROM t; SELECT 1"
+        self.assertEqual([s for _, s in split_script(sql, "sqlserver")], ["SELECT [a;b] FROM t", "SELECT 1"])
+        self.assertEqual([s for _, s in split_script(sql)], ["SELECT [a", "b] FROM t", "SELECT 1"])
+
+    def test_split_mysql(self):
+        # mysqldump ESCAPES QUOTES WITH A BACKSLASH
+        sql = "INSERT INTO t VALUES ('it\\'s; here', \"a\\\";b\", 'c\\\\'); SELECT 2;"
+        expected = [
+            (0, "INSERT INTO t VALUES ('it\\'s; here', \"a\\\";b\", 'c\\\\')"),
+            (len(sql) - len("SELECT 2;"), "SELECT 2"),
+        ]
+        self.assertEqual(list(split_script(sql, "mysql")), expected)
+        self.assertEqual(list(split_script(sql.encode("utf8"), "bigquery")), expected)
+        for size in range(1, len(sql) + 1):
+            scripts.CHUNK_SIZE = size
+            self.assertEqual(list(split_script(StringIO(sql), "mysql")), expected, f"chunk size {size}")
+            self.assertEqual(list(split_script(BytesIO(sql.encode("utf8")), "mysql")), expected, f"chunk size {size}")
+        # NOT AN ESCAPE IN OTHER DIALECTS
+        self.assertEqual(next(split_script(sql)), (0, "INSERT INTO t VALUES ('it\\'s"))
+
+    def test_unterminated(self):
+        self.assertEqual(list(split_script("SELECT 1; SELECT 'a;")), [(0, "SELECT 1"), (10, "SELECT 'a;")])
+        self.assertEqual(list(split_script("SELECT 1; /* a;")), [(0, "SELECT 1")])
+
+    def test_parse_script(self):
+        result = list(parse_script(StringIO(SCRIPT)))
+        self.assertEqual([tree for _, tree in result], [parse(s) for s in STATEMENTS])
+        result = list(parse_script("SELECT \"a;b\"; SELECT 'c'", dialect="mysql"))
+        self.assertEqual([tree for _, tree in result], [parse_mysql('SELECT "a;b"'), parse_mysql("SELECT 'c'")])
+        result = list(parse_script("SELECT [a] FROM t; SELECT b FROM [c]", dialect="sqlserver"))
+        self.assertEqual([tree for _, tree in result], [parse_sqlserver("SELECT [a] FROM t"), parse_sqlserver("SELECT b FROM [c]")])
+
+    def test_reads_lazily(self):
+        class Statements(object):
+            def __init__(self):
+                self.reads = 0
+
+            def read(self, size):
+                self.reads += 1
+                return "SELECT a FROM b;\n" * (size // 17 + 1)
+
+        source = Statements()
+        scripts.CHUNK_SIZE = 1000
+        result = parse_script(source)
+        for _ in range(100):
+            self.assertEqual(next(result)[1], parse("SELECT a FROM b"))
+        self.assertLessEqual(source.reads, 3)
+
+    def test_split_binary(self):
+        script = "SELECT 'ü;é' FROM t; SELECT \"ß\" FROM u".encode("utf8")
+        expected = [(0, "SELECT 'ü;é' FROM t"), (23, 'SELECT "ß" FROM u')]
+        self.assertEqual(list(split_script(script)), expected)
+        self.assertEqual(list(split_script(memoryview(script))), expected)
+        for size in range(1, len(script) + 1):
+            scripts.CHUNK_SIZE = size
+            self.assertEqual(list(split_script(BytesIO(script))), expected, f"chunk size {size}")
+
+    def test_private_map_is_not_released(self):
+        # THE CALLER'S PAGES ARE ONLY RELEASED WHEN ASKED
+        scripts.RELEASE_SIZE = 1000
+        script = (SCRIPT + ";").encode("utf8") * 100
+        with mmap.mmap(-1, len(script)) as mapped:
+            mapped[:] = script
+            self.assertEqual(len(list(split_script(mapped))), len(STATEMENTS) * 100)
+            self.assertEqual(mapped[:], script)
+
+    def test_parse_mapped_file(self):
+        scripts.RELEASE_SIZE = 1000
+        with tempfile.TemporaryFile() as file:
+            file.write((SCRIPT + ";").encode("utf8") * 100)
+            file.flush()
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                result = list(parse_script(mapped, release_pages=True))
+                self.assertEqual([tree for _, tree in result], [parse(s) for s in STATEMENTS] * 100)
+                for offset, _ in result[:3]:
+                    self.assertTrue(mapped[offset:].startswith(b"SELECT") or mapped[offset:].startswith(b"INSERT"))
@@ -0,0 +1,43 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from unittest import TestCase
+
+from mo_sql_parsing import normal_op, parse
+from mo_sql_parsing.utils import SQL_NULL, Call, scrub
+
+
+class TestScrub(TestCase):
+    def test_null_substitution(self):
+        tree = {"a": SQL_NULL, "b": [1, SQL_NULL], "c": Call("f", SQL_NULL, {}), "d": [SQL_NULL]}
+        self.assertEqual(scrub(tree, null="N"), {"a": "N", "b": [1, "N"], "c": {"f": "N"}, "d": "N"})
+        self.assertEqual(scrub(tree, null=None), {"a": None, "b": [1, None], "c": {"f": None}, "d": None})
+
+    def test_default_keeps_sql_null(self):
+        self.assertIs(scrub([SQL_NULL]), SQL_NULL)
+        self.assertIs(scrub([1, SQL_NULL])[1], SQL_NULL)
+
+    def test_parse_null(self):
+        self.assertEqual(
+            parse("SELECT f(NULL), g(NULL, 1) FROM t", null=0),
+            {"select": [{"value": {"f": 0}}, {"value": {"g": [0, 1]}}], "from": "t"},
+        )
+        self.assertEqual(
+            parse("SELECT g(NULL, 1)", calls=normal_op, null=None), {"select": {"value": {"op": "g", "args": [None, 1]}}},
+        )
+
+    def test_deep_tree(self):
+        depth = 100000
+        tree = "a"
+        for _ in range(depth):
+            tree = Call("f", [tree, 1], {})
+        result = scrub(tree)
+        for _ in range(depth):
+            result = result["f"][0]
+        self.assertEqual(result, "a")
@@ -0,0 +1,280 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+import ast
+import os
+import random
+from threading import Thread
+from unittest import TestCase
+
+from mo_times import Timer
+
+from mo_sql_parsing import normal_op, parse, parse_mysql, parse_sqlserver, simple_select
+from mo_sql_parsing.operators import reserved_words
+
+EXPRESSIONS = [
+    "a - 1",
+    "a -1",
+    "2 * -3",
+    "-1.5",
+    "a || b || c",
+    "(a + b) + c",
+    "a - (b - c)",
+    "a / b / c % d",
+    "a = b = c",
+    "a<>b OR a != b",
+    "NOT a = b AND c",
+    "NOT NOT a",
+    "a OR b AND c",
+    "a BETWEEN 1 + 2 AND 3 * 4",
+    "a NOT BETWEEN 1 AND 2 AND c",
+    "a IN (1)",
+    "a IN (1, 2)",
+    "a IN ('x', 'y')",
+    "a IN (-1, 2.5, 'x')",
+    "a IN (b, c)",
+    "a NOT IN (1, 2)",
+    "a IN (1, 2) = b",
+    "a IS NULL",
+    "a + 1 IS NOT NULL",
+    "a NOT LIKE 'x' || 'y'",
+    "a = 'it''s'",
+    "a = 'x\\n'",
+    "count(*)",
+    "COUNT(DISTINCT a)",
+    "max(-1) + sum(1.5)",
+    "coalesce(a, 0)",
+    "f()",
+    "f(t.*)",
+    "a.b.c",
+    "a IS TRUE",
+    "a = NULL",
+    "a IN (SELECT b FROM c)",
+    "a -- comment",
+    "a /* comment */",
+    "a <=> b",
+    "a||b",
+    "a IN (-1, 2)",
+    "a IN ((1), (2))",
+    "a IN (1, (2))",
+    "a NOT IN (-1, -2)",
+    "a IN (1.5, -2.5)",
+    "-3 || 'x'",
+    "-1 || -3",
+    "a IS NULL = b",
+    "a IS NOT NULL || 'x'",
+    "a IS NULL AND b IS NOT NULL OR c",
+    "a IN (1, 2) BETWEEN b AND c",
+    "a IN (1, 2) LIKE 'x'",
+    "a IN ('a') IS NULL",
+    "a IN (1) AND b NOT IN (2) OR c",
+    "(VALUES (1))",
+    "b IN (values (1))",
+    "b IN (1, values (1))",
+]
+
+OPERANDS = ["a", "b", "t.c", "1", "2.5", "-3", "-0.5", "'x'", "NULL", "TRUE", "0"]
+OPERATORS = ["||", "*", "/", "%", "+", "-", ">=", "<=", "<", ">", "=", "!=", "<>", "AND", "OR"]
+IN_ITEMS = ["1", "-1", "2.5", "-2.5", "'a'", "b", "NULL", "values (1)"]
+
+STATEMENTS = [
+    "SELECT *, a FROM t",
+    "SELECT DISTINCT a, b c, d AS e FROM t",
+    "select a.* from t a",
+    "SELECT a FROM t, u x, v AS y",
+    "SELECT a FROM t INNER JOIN u ON a = b LEFT OUTER JOIN v ON c = d CROSS JOIN w",
+    "SELECT a FROM t JOIN u ON a = b, w",
+    "SELECT a FROM t JOIN u USING (a)",
+    "SELECT a FROM s.t WHERE a = 1 GROUP BY a, b HAVING count(*) > 1 ORDER BY a, b DESC LIMIT 10 OFFSET 5",
+    "SELECT a FROM t LIMIT 1.5",
+    "SELECT a FROM t ORDER BY a NULLS FIRST",
+    "SELECT TOP 5 a FROM t",
+    "SELECT a FROM (SELECT a FROM t)",
+    "SELECT a FROM t UNION SELECT b FROM u",
+    "SELECT a FROM t;",
+]
+
+
+def random_expression(rand, depth=0):
+    """
+    :param rand: random.Random
+    :param depth: NESTING SO FAR
+    :return: SOME SQL EXPRESSION, MIXING THE OPERATORS THE FAST PATH KNOWS
+    """
+    output = random_operand(rand, depth)
+    for _ in range(rand.randint(0, 3)):
+        choice = rand.random()
+        if choice < 0.5:
+            output += f" {rand.choice(OPERATORS)} {random_operand(rand, depth + 1)}"
+        elif choice < 0.65:
+            items = ", ".join(rand.choice(IN_ITEMS) for _ in range(rand.randint(1, 3)))
+            output += f" {rand.choice(['IN', 'NOT IN'])} ({items})"
+        elif choice < 0.75:
+            output += rand.choice([" IS NULL", " IS NOT NULL"])
+        elif choice < 0.85:
+            low, high = random_operand(rand, depth + 1), random_operand(rand, depth + 1)
+            output += f" {rand.choice(['BETWEEN', 'NOT BETWEEN'])} {low} AND {high}"
+        else:
+            output += f" {rand.choice(['LIKE', 'NOT LIKE'])} {random_operand(rand, depth + 1)}"
+    return output
+
+
+def random_operand(rand, depth):
+    if depth > 2 or rand.random() < 0.45:
+        return rand.choice(OPERANDS)
+    choice = rand.random()
+    if choice < 0.1:
+        return random_expression(rand, depth + 1)
+    elif choice < 0.4:
+        return f"({random_expression(rand, depth + 1)})"
+    elif choice < 0.55:
+        params = ", ".join(random_expression(rand, depth + 1) for _ in range(rand.randint(1, 2)))
+        return f"{rand.choice(['f', 'count', 'max', 'coalesce'])}({params})"
+    elif choice < 0.6:
+        return "(VALUES (1))"
+    elif choice < 0.7:
+        return "NOT " + random_operand(rand, depth + 1)
+    else:
+        return "-" + rand.choice(["1", "2.5", "a"])
+
+
+def random_statement(rand):
+    columns = ", ".join(random_expression(rand) + rand.choice(["", " AS x", " y"]) for _ in range(rand.randint(1, 2)))
+    output = f"SELECT {columns}"
+    if rand.random() < 0.8:
+        output += " FROM t"
+    if rand.random() < 0.6:
+        output += f" WHERE {random_expression(rand)}"
+    if rand.random() < 0.2:
+        output += f" ORDER BY {random_expression(rand)}{rand.choice(['', ' DESC'])}"
+    return output
+
+
+def simple_queries():
+    """
+    :return: THE SELECT STATEMENTS FOUND IN test_simple.py
+    """
+    filename = os.path.join(os.path.dirname(__file__), "test_simple.py")
+    with open(filename) as file:
+        tree = ast.parse(file.read())
+    return [
+        node.value
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Constant)
+        and isinstance(node.value, str)
+        and node.value.lstrip().lower().startswith("select")
+    ]
+
+
+class TestSimpleSelect(TestCase):
+    def tearDown(self):
+        simple_select.enable()
+
+    def assertSameParse(self, sql, parser=parse, **kwargs):
+        simple_select.enable()
+        try:
+            result = parser(sql, **kwargs)
+        except Exception as cause:
+            result = type(cause)
+        simple_select.disable()
+        try:
+            expected = parser(sql, **kwargs)
+        except Exception as cause:
+            expected = type(cause)
+        self.assertEqual(result, expected, sql)
+
+    def test_expressions(self):
+        for e in EXPRESSIONS:
+            for sql in [
+                f"SELECT {e}",
+                f"SELECT f({e}), {e} AS z FROM t WHERE {e}",
+                f"SELECT x FROM a JOIN b ON {e} GROUP BY {e} HAVING {e} ORDER BY {e} DESC",
+            ]:
+                self.assertSameParse(sql)
+        self.assertSameParse("SELECT a IN (1, 2), b IS NULL FROM t", calls=normal_op)
+        self.assertSameParse("SELECT a = 1 FROM t WHERE b IS NULL", null=None)
+
+    def test_statements(self):
+        for sql in STATEMENTS:
+            for parser in [parse, parse_mysql, parse_sqlserver]:
+                self.assertSameParse(sql, parser)
+
+    def test_random_expressions(self):
+        # EVERY STATEMENT THE FAST PATH ACCEPTS MUST PARSE AS THE GRAMMAR DOES
+        rand = random.Random(42)
+        simple_select.reset()
+        for _ in range(100):
+            sql = random_statement(rand)
+            for parser in [parse, parse_mysql, parse_sqlserver]:
+                self.assertSameParse(sql, parser)
+        self.assertGreater(simple_select.stats()["hits"], 10)
+
+    def test_special_words(self):
+        for word in sorted(reserved_words) + ["date", "interval", "nocase", "top", "filter"]:
+            for sql in [
+                f"SELECT {word} FROM t",
+                f"SELECT {word}(a) FROM t",
+                f"SELECT a {word} FROM t",
+                f"SELECT a FROM {word}",
+                f"SELECT a FROM t {word}",
+                f"SELECT {word}.x FROM t WHERE {word} = 1",
+            ]:
+                self.assertSameParse(sql)
+
+    def test_counters(self):
+        simple_select.reset()
+        parse("SELECT a FROM t WHERE b = 1")
+        parse("SELECT a FROM t WHERE b = 1 UNION ALL SELECT c FROM d")
+        self.assertEqual(simple_select.stats(), {"hits": 1, "misses": 1})
+        simple_select.disable()
+        parse("SELECT a FROM t WHERE b = 1")
+        self.assertEqual(simple_select.stats(), {"hits": 1, "misses": 1})
+
+    def test_counters_from_threads(self):
+        parse("SELECT 1")
+        simple_select.reset()
+
+        def work():
+            for i in range(200):
+                parse(f"SELECT a FROM t WHERE b = {i}")
+
+        threads = [Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(simple_select.stats(), {"hits": 800, "misses": 0})
+
+    def test_deep_nesting(self):
+        sql = "SELECT " + "(" * 5000 + "a" + ")" * 5000
+        self.assertEqual(parse(sql), {"select": {"value": "a"}})
+        sql = "SELECT " + "f(" * 5000 + "a" + ")" * 5000 + " FROM t"
+        self.assertIsNotNone(simple_select.parse(sql))
+
+    def test_speed(self):
+        queries = []
+        for sql in simple_queries():
+            try:
+                parse(sql)
+                queries.append(sql)
+            except Exception:
+                pass
+
+        simple_select.reset()
+        with Timer("fast path") as fast:
+            for sql in queries:
+                parse(sql)
+        stats = simple_select.stats()
+        simple_select.disable()
+        with Timer("grammar") as slow:
+            for sql in queries:
+                parse(sql)
+
+        self.assertGreater(stats["hits"], len(queries) / 3)
+        self.assertLess(fast.duration.seconds, slow.duration.seconds)
@@ -0,0 +1,105 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase, skipIf
+
+from mo_sql_parsing import parse, snapshot, sql_parser
+
+try:
+    import cloudpickle
+except ImportError:
+    cloudpickle = None
+
+COLD_START = """
+import time
+start = time.time()
+from mo_sql_parsing import parse
+result = parse("SELECT a FROM b WHERE c = NULL")
+print(round(time.time() - start, 3), result)
+"""
+
+
+@skipIf(not cloudpickle, "requires cloudpickle")
+class TestSnapshot(TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.previous, snapshot.directory = snapshot.directory, self.temp.name
+
+    def tearDown(self):
+        snapshot.directory = self.previous
+        self.temp.cleanup()
+
+    def test_snapshot_parses_the_same(self):
+        snapshot.save("common", sql_parser.common_parser())
+        loaded = snapshot.load("common")
+        self.assertIsNotNone(loaded)
+
+        from mo_sql_parsing import _parse_string, simple_op
+
+        for sql in [
+            "SELECT a, b+1 AS c FROM t WHERE d IN (1, 2) AND e LIKE 'x%'",
+            "SELECT NULL, a FROM b WHERE c = NULL",
+            "SELECT CAST(a AS DECIMAL(10, 2)) FROM t GROUP BY a ORDER BY 1 DESC",
+        ]:
+            self.assertEqual(_parse_string(loaded, "common", sql, None, simple_op), parse(sql, null=None))
+
+    def test_snapshot_is_versioned(self):
+        self.assertIn(snapshot.snapshot_version(), snapshot.snapshot_path("mysql"))
+        self.assertIsNone(snapshot.load("mysql"))
+
+    def test_load_or_build(self):
+        built = snapshot.load_or_build("sqlserver", sql_parser.sqlserver_parser)
+        self.assertTrue(os.path.exists(snapshot.snapshot_path("sqlserver")))
+        loaded = snapshot.load_or_build("sqlserver", None)  # MUST NOT BUILD
+        self.assertIsNot(built, loaded)
+
+    def test_untrusted_snapshot_is_not_loaded(self):
+        snapshot.save("sqlserver", sql_parser.sqlserver_parser())
+        path = snapshot.snapshot_path("sqlserver")
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+        self.assertIsNotNone(snapshot.load("sqlserver"))
+
+        os.chmod(path, 0o666)  # ANYONE COULD HAVE WRITTEN IT
+        self.assertIsNone(snapshot.load("sqlserver"))
+        os.chmod(path, 0o644)
+        self.assertIsNotNone(snapshot.load("sqlserver"))
+
+        if hasattr(os, "symlink"):
+            os.rename(path, path + ".real")
+            os.symlink(path + ".real", path)
+            self.assertIsNone(snapshot.load("sqlserver"))
+
+    def test_is_trusted(self):
+        uid = os.getuid() if hasattr(os, "getuid") else 0
+        file = stat.S_IFREG | 0o644
+        self.assertTrue(snapshot.is_trusted(os.stat_result((file, 0, 0, 1, uid, 0, 0, 0, 0, 0))))
+        self.assertFalse(snapshot.is_trusted(os.stat_result((file | 0o020, 0, 0, 1, uid, 0, 0, 0, 0, 0))))
+        self.assertFalse(snapshot.is_trusted(os.stat_result((stat.S_IFDIR | 0o700, 0, 0, 1, uid, 0, 0, 0, 0, 0))))
+        if hasattr(os, "getuid"):
+            self.assertFalse(snapshot.is_trusted(os.stat_result((file, 0, 0, 1, uid + 1, 0, 0, 0, 0, 0))))
+
+    def test_cold_start(self):
+        snapshot.save("common", sql_parser.common_parser())
+        env = {k: v for k, v in os.environ.items() if k != snapshot.SNAPSHOT_DIRECTORY}
+        env["PYTHONPATH"] = os.pathsep.join(sys.path)
+        without_snapshot = _run(env)
+        with_snapshot = _run({**env, snapshot.SNAPSHOT_DIRECTORY: self.temp.name})
+        self.assertEqual(without_snapshot[1], with_snapshot[1])
+        print(f"cold start: {without_snapshot[0]} seconds without snapshot, {with_snapshot[0]} seconds with snapshot")
+
+
+def _run(env):
+    output = subprocess.run([sys.executable, "-c", COLD_START], env=env, capture_output=True, text=True, check=True)
+    seconds, result = output.stdout.strip().split(" ", 1)
+    return float(seconds), result
@@ -0,0 +1,92 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from unittest import TestCase
+
+from mo_times import Timer
+
+from mo_sql_parsing import normal_op, parse, parse_mysql, parse_sqlserver, simple_select, templates
+from mo_sql_parsing.templates import to_template
+
+
+class TestTemplates(TestCase):
+    def setUp(self):
+        self.cache = templates.enable()
+
+    def tearDown(self):
+        templates.disable()
+        simple_select.enable()
+
+    def assertSameParse(self, sql, parser=parse, **kwargs):
+        result = parser(sql, **kwargs)
+        templates.disable()
+        expected = parser(sql, **kwargs)
+        templates.template_cache = self.cache
+        self.assertEqual(result, expected)
+
+    def test_literals_share_template(self):
+        self.assertSameParse("SELECT a FROM t WHERE id = 123 AND name = 'kyle'")
+        self.assertSameParse("SELECT a FROM t WHERE id = 456 AND name = 'it''s'")
+        self.assertSameParse("SELECT a FROM t WHERE id = 7 AND name = ''")
+        stats = self.cache.stats()
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["hits"], 2)
+
+    def test_kinds_of_literal(self):
+        for sql in [
+            "SELECT 1.5, -2.25e3, .5, 0x1F, 1e3, 'a\\nb' FROM t LIMIT 10",
+            "SELECT 7.0, -3.5, .25, 0xAB, 2e2, 'x' FROM t LIMIT 20",
+        ]:
+            self.assertSameParse(sql)
+            self.assertSameParse(sql, calls=normal_op)
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+    def test_negative(self):
+        self.assertSameParse("SELECT -1, a - 2, -3.5 FROM t")
+        self.assertSameParse("SELECT -4, a - 5, -6.5 FROM t")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_not_literals(self):
+        template, literals = to_template(
+            "SELECT a1, \"b 2\", `c'3`, t.x4 FROM t -- it's 5\n/* 6 */ WHERE d = 7 # 8", "mysql"
+        )
+        self.assertEqual(literals, [("int", "7")])
+        self.assertIn("-- it's 5", template)
+        template, literals = to_template("SELECT [a '1'] FROM t WHERE b IN (1, 'x')", "sqlserver")
+        self.assertEqual(literals, [("int", "1"), ("string", "'x'")])
+
+    def test_interval(self):
+        self.assertSameParse("SELECT INTERVAL '1'")
+        self.assertSameParse("SELECT INTERVAL '1:2' DAY")
+        self.assertSameParse("SELECT INTERVAL 3 DAY")
+        self.assertSameParse("SELECT INTERVAL 4 DAY")
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def test_dialects(self):
+        self.assertSameParse("SELECT \"a\" FROM t WHERE b = 'x'", parser=parse_mysql)
+        self.assertSameParse("SELECT [a] FROM t WHERE b = 'x'", parser=parse_sqlserver)
+        self.assertSameParse("SELECT [a] FROM t WHERE b = 'y'", parser=parse_sqlserver)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_result_is_safe_to_mutate(self):
+        parse("SELECT a FROM t WHERE b = 1")["where"].clear()
+        self.assertEqual(parse("SELECT a FROM t WHERE b = 2"), {"select": {"value": "a"}, "from": "t", "where": {"eq": ["b", 2]}})
+
+    def test_template_speed(self):
+        sql = "SELECT a, b+1 AS c FROM t WHERE d IN ({0}, 2) AND e LIKE '{0}%' ORDER BY a"
+        simple_select.disable()  # COMPARE WITH THE GRAMMAR
+        parse(sql.format(0))
+        with Timer("template") as hits:
+            for i in range(10):
+                parse(sql.format(i + 1))
+        templates.disable()
+        with Timer("parse") as parsing:
+            for i in range(10):
+                parse(sql.format(i + 1))
+        self.assertLess(hits.duration.seconds * 10, parsing.duration.seconds)
@@ -0,0 +1,43 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from threading import Thread
+from unittest import TestCase
+
+from mo_sql_parsing import parse, normal_op, simple_op
+
+
+class TestThreads(TestCase):
+    def test_concurrent_parse_keeps_per_call_options(self):
+        sql = "SELECT a FROM b WHERE c = NULL OR d IN (1, NULL)"
+        expected = {
+            simple_op: parse(sql, null=None, calls=simple_op),
+            normal_op: parse(sql, null={"nil": {}}, calls=normal_op),
+        }
+        failures = []
+
+        def worker(calls, null):
+            try:
+                for _ in range(20):
+                    result = parse(sql, null=null, calls=calls)
+                    if result != expected[calls]:
+                        failures.append(result)
+            except Exception as cause:
+                failures.append(cause)
+
+        threads = [
+            Thread(target=worker, args=(simple_op, None) if i % 2 else (normal_op, {"nil": {}})) for i in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(failures, [])
+        self.assertEqual(expected[simple_op]["where"]["or"][1], {"in": ["d", [1, None]]})